@@ -1,7 +1,9 @@
-import TelegramBot from 'node-telegram-bot-api';
 import { listConversations, getConversationCount } from '../persistence/conversations.js';
 import { getTotalMessageCount } from '../persistence/messages.js';
 
+// node-telegram-bot-api is only needed when the admin bot is enabled — loaded on initialize()
+let TelegramBot = null;
+
 /**
  * Telegram admin bot — admin-only, NOT a user transport.
  * Provides system status, conversation list, and basic control via Telegram.
@@ -27,6 +29,7 @@ export function createTelegramAdmin(config, transportManager, aiProvider, logger
     }
 
     try {
+      TelegramBot ??= (await import('node-telegram-bot-api')).default;
       bot = new TelegramBot(config.telegram.botToken, { polling: true });
 
       bot.on('polling_error', (err) => {
@@ -117,8 +120,8 @@ export function createTelegramAdmin(config, transportManager, aiProvider, logger
     if (bot) {
       try {
         await bot.stopPolling();
-      } catch {
-        // ignore
+      } catch (err) {
+        log('debug', `stopPolling failed: ${err.message}`);
       }
       bot = null;
       log('info', 'Telegram admin bot stopped');
@@ -1,6 +1,8 @@
 // Security-first. Creator-ready. Future-proof.
-import OpenAI from 'openai';
-import { buildMcpRoutingInstruction, selectEphemeralMcpIntegrations } from '../core/mcpIntegrations.js';
+
+// The OpenAI SDK is only needed on the cloud path — loaded on first use, so
+// Local AI setups never evaluate it
+let OpenAI = null;
 
 const LOCAL_PROVIDER = 'lmstudio';
 const MCP_MODE_DISABLED = 'disabled';
@@ -32,11 +34,18 @@ function createOpenAIProvider(aiConfig) {
     clientOpts.baseURL = openaiBaseUrl;
   }
 
-  const client = new OpenAI(clientOpts);
-
+  let client = null;
   let connected = false;
   let lastError = null;
 
+  async function getClient() {
+    if (!client) {
+      OpenAI ??= (await import('openai')).default;
+      client = new OpenAI(clientOpts);
+    }
+    return client;
+  }
+
   async function generateReply(messages, options = {}) {
     const model = options.model || openaiModel;
     const temperature = options.temperature ?? 0.7;
@@ -44,6 +53,16 @@ function createOpenAIProvider(aiConfig) {
     const signal = options.signal;
     const hasMultimodal = messages.some(m => Array.isArray(m.content));
 
+    let client;
+    try {
+      client = await getClient();
+    } catch (err) {
+      // SDK missing or client construction failed — report it like a failed request
+      connected = false;
+      lastError = classifyOpenAIError(err);
+      throw lastError;
+    }
+
     let lastErr = null;
 
     for (let attempt = 0; attempt < 3; attempt++) {
@@ -102,6 +121,7 @@ function createOpenAIProvider(aiConfig) {
 
   async function testConnection() {
     try {
+      const client = await getClient();
       const response = await client.chat.completions.create({
         model: openaiModel,
         messages: [{ role: 'user', content: 'Say OK' }],
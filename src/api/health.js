@@ -1,3 +1,4 @@
+import { performance } from 'node:perf_hooks';
 import { getDatabase } from '../persistence/database.js';
 import { getIO } from '../realtime/socket.js';
 import { getConversationCount } from '../persistence/conversations.js';
@@ -9,7 +10,7 @@ import { getTotalMessageCount } from '../persistence/messages.js';
  */
 export default async function healthRoutes(fastify, opts) {
   const { config, aiProvider, transportManager, orchestrator } = opts;
-  const startTime = Date.now();
+  const startTime = performance.now(); // monotonic — uptime survives wall-clock steps
 
   fastify.get('/api/health', async () => {
     const dbInitialized = getDatabase() !== null;
@@ -18,7 +19,7 @@ export default async function healthRoutes(fastify, opts) {
       success: true,
       data: {
         version: config.version,
-        uptime: Math.floor((Date.now() - startTime) / 1000),
+        uptime: Math.floor((performance.now() - startTime) / 1000),
         environment: {
           nodeVersion: process.version,
           platform: process.platform,
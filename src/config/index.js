@@ -1,10 +1,9 @@
 import dotenv from 'dotenv';
 import { readFileSync } from 'node:fs';
-import { join, dirname } from 'node:path';
 import { fileURLToPath } from 'node:url';
-import { DEFAULT_LOCAL_AI_BASE_URL, DEFAULT_LOCAL_AI_MODEL, DEFAULT_WEB_SEARCH_PROVIDER, getDefaultEphemeralMcpIntegrations } from '../core/mcpIntegrations.js';
+import { DEFAULT_LOCAL_AI_BASE_URL, DEFAULT_LOCAL_AI_MODEL } from '../core/mcpIntegrations.js';
 
-const __dirname = dirname(fileURLToPath(import.meta.url));
+const PACKAGE_JSON_PATH = fileURLToPath(new URL('../../package.json', import.meta.url));
 
 // ── Canonical enum values ──────────────────────────────────────────────────
 export const VALID_TONES = ['professional', 'friendly', 'casual', 'playful'];
@@ -19,11 +18,14 @@ export const VALID_AI_APPROACH_DELAY_MINUTES = [5, 10, 15, 20, 30, 45, 60, 90, 1
 
 // ── Helpers ────────────────────────────────────────────────────────────────
 
+const TRUE_VALUES = new Set(['true', '1', 'yes', 'on']);
+const FALSE_VALUES = new Set(['false', '0', 'no', 'off']);
+
 function parseBoolean(value, fallback = false) {
   if (value === undefined || value === null || value === '') return fallback;
   const lower = String(value).toLowerCase().trim();
-  if (['true', '1', 'yes', 'on'].includes(lower)) return true;
-  if (['false', '0', 'no', 'off'].includes(lower)) return false;
+  if (TRUE_VALUES.has(lower)) return true;
+  if (FALSE_VALUES.has(lower)) return false;
   return fallback;
 }
 
@@ -55,14 +57,18 @@ function isJsonArray(value) {
   }
 }
 
+let packageVersion = null;
+
+// package.json does not change while the process runs — read it once
 function getVersion() {
-  try {
-    const pkgPath = join(__dirname, '../../package.json');
-    const pkg = JSON.parse(readFileSync(pkgPath, 'utf-8'));
-    return pkg.version || '0.0.0';
-  } catch {
-    return '0.0.0';
+  if (packageVersion === null) {
+    try {
+      packageVersion = JSON.parse(readFileSync(PACKAGE_JSON_PATH, 'utf-8')).version || '0.0.0';
+    } catch {
+      packageVersion = '0.0.0';
+    }
   }
+  return packageVersion;
 }
 
 // ── Main validation ────────────────────────────────────────────────────────
@@ -280,26 +286,33 @@ export function loadConfig() {
  * Print a safe config summary to the logger.
  */
 export function logConfigSummary(config, logger) {
-  logger.info('┌──────────────────────────────────────┐');
-  logger.info('│       AnomChatBot Configuration       │');
-  logger.info('├──────────────────────────────────────┤');
-  logger.info(`│ Version:     ${config.version}`);
-  logger.info(`│ Listen:      ${config.host}:${config.port}`);
-  logger.info(`│ Log level:   ${config.logLevel}`);
-  logger.info(`│ Database:    ${config.databasePath}`);
-  logger.info('├──────────────────────────────────────┤');
-  logger.info(`│ AI provider: ${config.ai.provider} (${config.ai.openaiModel})`);
-  logger.info(`│ AI key:      ${redactSecret(config.ai.openaiApiKey)}`);
+  // Built up front and logged as one record — one pass through the logger,
+  // pretty transport and log bus instead of one per line
+  const lines = [
+    '┌──────────────────────────────────────┐',
+    '│       AnomChatBot Configuration       │',
+    '├──────────────────────────────────────┤',
+    `│ Version:     ${config.version}`,
+    `│ Listen:      ${config.host}:${config.port}`,
+    `│ Log level:   ${config.logLevel}`,
+    `│ Database:    ${config.databasePath}`,
+    '├──────────────────────────────────────┤',
+    `│ AI provider: ${config.ai.provider} (${config.ai.openaiModel})`,
+    `│ AI key:      ${redactSecret(config.ai.openaiApiKey)}`,
+  ];
   if (config.ai.openaiBaseUrl) {
-    logger.info(`│ AI base URL: ${config.ai.openaiBaseUrl}`);
+    lines.push(`│ AI base URL: ${config.ai.openaiBaseUrl}`);
   }
-  logger.info(`│ WhatsApp:    ${config.whatsapp.mode}`);
-  logger.info(`│ Telegram:    ${config.telegram.enabled ? 'enabled' : 'disabled'}`);
-  logger.info('├──────────────────────────────────────┤');
-  logger.info(`│ Tone:        ${config.defaults.tone}`);
-  logger.info(`│ Flirt:       ${config.defaults.flirt}`);
-  logger.info(`│ Temperature: ${config.defaults.temperature}`);
-  logger.info(`│ Max tokens:  ${config.defaults.maxTokens}`);
-  logger.info(`│ History:     ${config.defaults.maxHistory}`);
-  logger.info('└──────────────────────────────────────┘');
+  lines.push(
+    `│ WhatsApp:    ${config.whatsapp.mode}`,
+    `│ Telegram:    ${config.telegram.enabled ? 'enabled' : 'disabled'}`,
+    '├──────────────────────────────────────┤',
+    `│ Tone:        ${config.defaults.tone}`,
+    `│ Flirt:       ${config.defaults.flirt}`,
+    `│ Temperature: ${config.defaults.temperature}`,
+    `│ Max tokens:  ${config.defaults.maxTokens}`,
+    `│ History:     ${config.defaults.maxHistory}`,
+    '└──────────────────────────────────────┘',
+  );
+  logger.info(`\n${lines.join('\n')}`);
 }
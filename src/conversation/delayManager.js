@@ -94,6 +94,29 @@ export function createDelayManager({ onReady, logger }) {
     return state?.version === version;
   }
 
+  /**
+   * Re-arm the timer for a pending reply without changing its version
+   * (e.g. when the reply was throttled). A newer message still supersedes it.
+   *
+   * @param {string} conversationId
+   * @param {number} version
+   * @param {number} delay — ms until onReady fires again
+   * @returns {boolean} false if the version is no longer current
+   */
+  function retry(conversationId, version, delay) {
+    const state = pending.get(conversationId);
+    if (state?.version !== version) return false;
+
+    if (state.timer) clearTimeout(state.timer);
+    state.timer = setTimeout(() => {
+      state.timer = null;
+      onReady(conversationId, version);
+    }, delay);
+
+    log('debug', `Retrying reply for ${conversationId} in ${delay}ms (v${version})`);
+    return true;
+  }
+
   /**
    * Mark a conversation's pending reply as completed.
    * Called after the AI reply has been successfully sent (or abandoned).
@@ -160,6 +183,7 @@ export function createDelayManager({ onReady, logger }) {
   return {
     scheduleReply,
     isCurrentVersion,
+    retry,
     complete,
     cancel,
     hasPending,
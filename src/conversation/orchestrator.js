@@ -1,4 +1,4 @@
-import { DEFAULT_LOCAL_AI_BASE_URL, DEFAULT_LOCAL_AI_MODEL, getDefaultEphemeralMcpIntegrations } from '../core/mcpIntegrations.js';
+import { DEFAULT_LOCAL_AI_BASE_URL, DEFAULT_LOCAL_AI_MODEL } from '../core/mcpIntegrations.js';
 import {
   getOrCreateConversation,
   getConversation,
@@ -15,14 +15,20 @@ import {
   updateMessageContent,
   addMediaMetadata,
 } from '../persistence/messages.js';
-import { getSettingsBulk } from '../persistence/settings.js';
+import { runInTransaction } from '../persistence/database.js';
+import { getSettingsBulk, getSettingsVersion } from '../persistence/settings.js';
 import { buildMessages } from './promptBuilder.js';
 import { createDelayManager } from './delayManager.js';
 import { createPresenceManager } from './presenceManager.js';
 import { createOutgoingQueue } from './outgoingQueue.js';
 import { createApproachManager } from './approachManager.js';
+import { createRateLimiter } from './rateLimiter.js';
 import { createAIProvider, normalizeEphemeralMcpIntegrations } from '../ai/provider.js';
 import { downloadAndStore } from '../media/storage.js';
+import { createTaskLimiter } from '../core/taskLimiter.js';
+
+const MAX_CONCURRENT_MEDIA_DOWNLOADS = 3;
+const MAX_CONCURRENT_AI_REQUESTS = 4;
 
 /**
  * Create the conversation orchestrator.
@@ -34,9 +40,10 @@ import { downloadAndStore } from '../media/storage.js';
  * @param {object} opts
  * @param {function} opts.getTransport — Returns the current transport adapter
  * @param {object} opts.logger — Pino logger
+ * @param {object} [opts.replyRateLimiter] — per-conversation reply limiter (injectable for tests)
  * @returns {object} Orchestrator
  */
-export function createOrchestrator(config, aiProvider, io, { getTransport, logger } = {}) {
+export function createOrchestrator(config, aiProvider, io, { getTransport, logger, replyRateLimiter: injectedReplyRateLimiter } = {}) {
 
   function emit(event, data) {
     if (io) io.emit(event, data);
@@ -77,12 +84,24 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
     },
   });
 
+  // ── Reply rate limiter ───────────────────────────────────────────────
+  // Per-conversation token bucket: bursts of 5 replies, 1 reply / 2 s sustained
+  const replyRateLimiter = injectedReplyRateLimiter ?? createRateLimiter({ capacity: 5, refillPerSecond: 0.5 });
+
+  // Media downloads run in the background; cap how many hit the network/disk at once
+  const mediaDownloadLimiter = createTaskLimiter(MAX_CONCURRENT_MEDIA_DOWNLOADS);
+
+  // A burst across many conversations must not fan out into as many parallel AI calls
+  const aiRequestLimiter = createTaskLimiter(MAX_CONCURRENT_AI_REQUESTS);
+
   // Store message keys per conversation for read receipts
   const pendingMessageKeys = new Map();
 
   // Cache per-conversation AI providers to avoid recreating each call
   const conversationProviders = new Map();
   const activeGenerations = new Map();
+  // Resolved global provider, reused until the settings table changes
+  let globalProviderMemo = null; // { version, provider }
 
   /**
    * Get the AI provider for a conversation.
@@ -129,8 +148,19 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
   /**
    * Check global settings table for runtime AI overrides.
    * Returns a cached provider if global overrides are configured, or null.
+   * Memoized on the settings version — the 14-key read and cache-key
+   * building only rerun after a settings write.
    */
   function _getGlobalAIProvider() {
+    const version = getSettingsVersion();
+    if (globalProviderMemo?.version === version) return globalProviderMemo.provider;
+
+    const provider = _resolveGlobalAIProvider();
+    globalProviderMemo = { version, provider };
+    return provider;
+  }
+
+  function _resolveGlobalAIProvider() {
     const settings = getSettingsBulk([
       'ai_provider', 'ai_base_url', 'ai_model', 'ai_api_key',
       'local_ai_enabled', 'local_ai_provider', 'local_ai_base_url', 'local_ai_model',
@@ -238,6 +268,22 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
     emit('bot:activity', { conversationId, state: 'idle' });
   }
 
+  /**
+   * Generate an AI reply once a request slot is free.
+   * A generation cancelled while waiting for its slot never reaches the provider.
+   */
+  function _generateReply(provider, messages, conversation, generation) {
+    const { signal } = generation.controller;
+    return aiRequestLimiter.run(() => {
+      signal.throwIfAborted();
+      return provider.generateReply(messages, {
+        temperature: conversation.temperature,
+        max_tokens: conversation.max_tokens,
+        signal,
+      });
+    });
+  }
+
   function normalizeAssistantContent(content, recentMessages) {
     const trimmed = String(content || '').trim();
     if (trimmed) return trimmed;
@@ -284,7 +330,7 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
           conversation.max_history ?? config.defaults.maxHistory,
         );
 
-    const messages = buildMessages(conversation, recentMessages, config, {
+    const messages = await buildMessages(conversation, recentMessages, config, {
       isApproachMessage: true,
       approachNumber: approachInfo.messageNumber,
       maxApproaches: approachInfo.maxMessages,
@@ -294,11 +340,7 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
     let aiReply;
     try {
       const provider = getAIProvider(conversation);
-      aiReply = await provider.generateReply(messages, {
-        temperature: conversation.temperature,
-        max_tokens: conversation.max_tokens,
-        signal: generation.controller.signal,
-      });
+      aiReply = await _generateReply(provider, messages, conversation, generation);
       if (!isCurrentGeneration(conversationId, generation)) return;
       aiReply.content = normalizeAssistantContent(aiReply.content, recentMessages);
     } catch (err) {
@@ -339,6 +381,16 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
       return;
     }
 
+    // In-memory gate first — a throttled reply never touches the database.
+    // It is postponed, not dropped: the same version fires again once a token
+    // is available (and a newer message still supersedes it meanwhile).
+    if (!replyRateLimiter.tryAcquire(conversationId)) {
+      const waitMs = replyRateLimiter.retryAfter(conversationId);
+      log('warn', `AI reply rate-limited for ${conversationId}, retrying in ${Math.ceil(waitMs)}ms`);
+      delayManager.retry(conversationId, version, waitMs);
+      return;
+    }
+
     const conversation = getConversation(conversationId);
     if (!conversation) {
       log('warn', `Conversation ${conversationId} not found for delayed reply`);
@@ -358,17 +410,13 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
           conversation.max_history ?? config.defaults.maxHistory,
         );
 
-    const messages = buildMessages(conversation, recentMessages, config);
+    const messages = await buildMessages(conversation, recentMessages, config);
 
     const generation = beginGeneration(conversationId);
     let aiReply;
     try {
       const provider = getAIProvider(conversation);
-      aiReply = await provider.generateReply(messages, {
-        temperature: conversation.temperature,
-        max_tokens: conversation.max_tokens,
-        signal: generation.controller.signal,
-      });
+      aiReply = await _generateReply(provider, messages, conversation, generation);
       if (!isCurrentGeneration(conversationId, generation)) return;
       aiReply.content = normalizeAssistantContent(aiReply.content, recentMessages);
     } catch (err) {
@@ -402,11 +450,15 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
 
     emit('message:new', { conversationId, message: aiMessage });
 
+    // Release the delay slot before the send — the review countdown and typing
+    // simulation can take a while, and a message arriving meanwhile must get
+    // its own reply timer rather than have it cleared when this send finishes
+    delayManager.complete(conversationId);
+
     // Send via transport with operator review + presence simulation
     await _sendWithPresence(conversation, aiMessage, aiReply.content, { source: 'ai' });
 
     touchConversation(conversationId);
-    delayManager.complete(conversationId);
   }
 
   /**
@@ -499,27 +551,30 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
    * On failure: logs error, message retains its placeholder content.
    */
   function _downloadMediaAsync(conversationId, messageId, mediaInfo, downloadFn) {
-    downloadAndStore({
+    mediaDownloadLimiter.run(() => downloadAndStore({
       download: downloadFn,
       mediaType: mediaInfo.media_type,
       mimeType: mediaInfo.media_mime_type,
       originalName: mediaInfo.original_name,
       messageId,
-    }).then((stored) => {
-      // Update message row with file path + resolved metadata
-      const updated = updateMessageMedia(messageId, {
-        media_path: stored.servePath,
-        media_mime_type: stored.mimeType,
-        media_size_bytes: stored.sizeBytes,
-      });
-
-      // Insert enriched metadata record
-      addMediaMetadata(messageId, {
-        media_type: mediaInfo.media_type,
-        mime_type: stored.mimeType,
-        file_size: stored.sizeBytes,
-        file_path: stored.servePath,
-        original_url: mediaInfo.media_url ?? null,
+      expectedSizeBytes: mediaInfo.media_size_bytes,
+    })).then((stored) => {
+      // Update message row with file path + resolved metadata, and insert the
+      // enriched metadata record, in one commit
+      const updated = runInTransaction(() => {
+        const row = updateMessageMedia(messageId, {
+          media_path: stored.servePath,
+          media_mime_type: stored.mimeType,
+          media_size_bytes: stored.sizeBytes,
+        });
+        addMediaMetadata(messageId, {
+          media_type: mediaInfo.media_type,
+          mime_type: stored.mimeType,
+          file_size: stored.sizeBytes,
+          file_path: stored.servePath,
+          original_url: mediaInfo.media_url ?? null,
+        });
+        return row;
       });
 
       // Notify GUI that the message was updated with media
@@ -563,24 +618,26 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
       max_history: config.defaults.maxHistory,
     };
 
-    const { conversation, created } = getOrCreateConversation(platform, remoteId, displayName, defaults);
+    // 2. Persist user message immediately (non-blocking — media downloaded after).
+    // Conversation upsert, message insert and activity touch share one commit.
+    const { conversation, created, userMessage } = runInTransaction(() => {
+      const result = getOrCreateConversation(platform, remoteId, displayName, defaults);
+      const row = addMessage(result.conversation.id, 'user', content, {
+        direction: 'inbound',
+        media_type: mediaInfo?.media_type ?? null,
+        media_url: mediaInfo?.media_url ?? null,
+        media_path: mediaInfo?.media_path ?? null,
+        media_mime_type: mediaInfo?.media_mime_type ?? null,
+        media_size_bytes: mediaInfo?.media_size_bytes ?? null,
+      });
+      touchConversation(result.conversation.id);
+      return { ...result, userMessage: row };
+    });
 
     if (created) {
       emit('conversation:new', { conversation });
     }
-
-    // 2. Persist user message immediately (non-blocking — media downloaded after)
-    const userMessage = addMessage(conversation.id, 'user', content, {
-      direction: 'inbound',
-      media_type: mediaInfo?.media_type ?? null,
-      media_url: mediaInfo?.media_url ?? null,
-      media_path: mediaInfo?.media_path ?? null,
-      media_mime_type: mediaInfo?.media_mime_type ?? null,
-      media_size_bytes: mediaInfo?.media_size_bytes ?? null,
-    });
-
     emit('message:new', { conversationId: conversation.id, message: userMessage });
-    touchConversation(conversation.id);
 
     // 3. Async media download — fire-and-forget, updates message row on completion
     if (mediaInfo && typeof downloadMedia === 'function') {
@@ -652,33 +709,44 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
       log('info', `Cancelled AI approach for ${conversationId} — operator message`);
     }
 
-    // Persist operator message as 'assistant' (operator IS the bot persona)
-    const message = addMessage(conversationId, 'assistant', content, {
-      direction: 'outbound',
-      delivery_status: 'queued',
+    const transport = getTransport?.();
+    const canSend = Boolean(transport && conversation.remote_id);
+    const isFirstMessage = conversation.first_message_sent_manually === 0;
+    let delivery = { status: 'queued' };
+    let sendPromise = null;
+
+    // Persist operator message as 'assistant' (operator IS the bot persona).
+    // First-message rule: the first operator message also enables auto-reply —
+    // both writes share one commit.
+    const message = runInTransaction(() => {
+      const row = addMessage(conversationId, 'assistant', content, {
+        direction: 'outbound',
+        delivery_status: canSend ? 'sending' : 'queued',
+      });
+      if (isFirstMessage) {
+        updateConversationSettings(conversationId, {
+          auto_reply: 1,
+          first_message_sent_manually: 1,
+        });
+      }
+      return row;
     });
 
     emit('message:new', { conversationId, message });
 
-    // First-message rule: mark the first operator message and keep GUI state in sync.
-    if (conversation.first_message_sent_manually === 0) {
-      updateConversationSettings(conversationId, {
-        auto_reply: 1,
-        first_message_sent_manually: 1,
-      });
-      emit('conversation:update', { conversation: getConversation(conversationId) });
-    }
-
     // Send to WhatsApp via transport
-    const transport = getTransport?.();
-    let delivery = { status: 'queued' };
-
-    if (transport && conversation.remote_id) {
-      updateDeliveryStatus(message.id, 'sending');
+    if (canSend) {
       _emitMessageStatus(conversationId, message.id, 'sending');
+      sendPromise = (async () => transport.sendMessage(conversation.remote_id, content))();
+    }
+
+    if (isFirstMessage) {
+      emit('conversation:update', { conversation: getConversation(conversationId) });
+    }
 
+    if (canSend) {
       try {
-        const sendResult = await transport.sendMessage(conversation.remote_id, content);
+        const sendResult = await sendPromise;
 
         if (sendResult.success) {
           updateDeliveryStatus(message.id, 'sent');
@@ -758,6 +826,7 @@ export function createOrchestrator(config, aiProvider, io, { getTransport, logge
     presenceManager.shutdown();
     approachManager.shutdown();
     outgoingQueue.shutdown();
+    replyRateLimiter.shutdown();
   }
 
   return {
@@ -1,4 +1,5 @@
 // Security-first. Creator-ready. Future-proof.
+import { performance } from 'node:perf_hooks';
 
 const DEFAULT_REVIEW_DELAY_MS = 3000;
 const MAX_CONTENT_LENGTH = 8000;
@@ -8,8 +9,16 @@ const MAX_CONTENT_LENGTH = 8000;
  * - In-memory queue keeps unsent AI replies operator-reviewable without new persistence risk.
  * - One timer per outgoing message is simple, inspectable, and cheap for human chat volumes.
  * - Mutations are explicit actions (pause/resume/edit/delete) with sanitized payloads.
+ * - Countdowns run on the monotonic clock, so a wall-clock step (NTP correction,
+ *   manual change) cannot shorten or stretch a review window; wall time is
+ *   derived only for display.
+ *
+ * @param {object} [opts]
+ * @param {object} [opts.logger]
+ * @param {function} [opts.onChange] — called with (action, publicEntry) on every change
+ * @param {function} [opts.now] — monotonic clock in ms (injectable for tests)
  */
-export function createOutgoingQueue({ logger, onChange } = {}) {
+export function createOutgoingQueue({ logger, onChange, now = () => performance.now() } = {}) {
   const entries = new Map();
   let sequence = 0;
 
@@ -17,15 +26,19 @@ export function createOutgoingQueue({ logger, onChange } = {}) {
     if (logger?.[level]) logger[level]({ ...meta }, `[outgoing-queue] ${msg}`);
   }
 
+  function publicEntry(entry) {
+    return toPublicEntry(entry, now());
+  }
+
   function notify(action, entry) {
-    onChange?.(action, toPublicEntry(entry));
+    onChange?.(action, publicEntry(entry));
   }
 
   function scheduleTimer(entry) {
     clearTimer(entry);
     if (entry.status !== 'queued') return;
 
-    entry.deadlineAt = Date.now() + entry.remainingMs;
+    entry.deadline = now() + entry.remainingMs;
     entry.timer = setTimeout(() => resolveEntry(entry.id, 'send'), entry.remainingMs);
     notify('upsert', entry);
   }
@@ -65,7 +78,7 @@ export function createOutgoingQueue({ logger, onChange } = {}) {
         source: sanitizeSource(source),
         status: 'queued',
         createdAt: Date.now(),
-        deadlineAt: null,
+        deadline: null, // monotonic ms while queued
         remainingMs: safeDelayMs,
         timer: null,
         settled: false,
@@ -91,25 +104,25 @@ export function createOutgoingQueue({ logger, onChange } = {}) {
 
   function pause(id) {
     const entry = requireEntry(id);
-    if (entry.status === 'paused') return toPublicEntry(entry);
+    if (entry.status === 'paused') return publicEntry(entry);
     if (entry.status !== 'queued') throw new Error('Only queued outgoing messages can be paused');
 
-    entry.remainingMs = Math.max(0, entry.deadlineAt - Date.now());
+    entry.remainingMs = Math.max(0, entry.deadline - now());
     entry.status = 'paused';
-    entry.deadlineAt = null;
+    entry.deadline = null;
     clearTimer(entry);
     notify('upsert', entry);
-    return toPublicEntry(entry);
+    return publicEntry(entry);
   }
 
   function resume(id) {
     const entry = requireEntry(id);
-    if (entry.status === 'queued') return toPublicEntry(entry);
+    if (entry.status === 'queued') return publicEntry(entry);
     if (entry.status !== 'paused') throw new Error('Only paused outgoing messages can be resumed');
 
     entry.status = 'queued';
     scheduleTimer(entry);
-    return toPublicEntry(entry);
+    return publicEntry(entry);
   }
 
   function edit(id, content) {
@@ -117,14 +130,14 @@ export function createOutgoingQueue({ logger, onChange } = {}) {
     if (!['queued', 'paused'].includes(entry.status)) throw new Error('Outgoing message can no longer be edited');
 
     if (entry.status === 'queued') {
-      entry.remainingMs = Math.max(0, entry.deadlineAt - Date.now());
-      entry.deadlineAt = null;
+      entry.remainingMs = Math.max(0, entry.deadline - now());
+      entry.deadline = null;
       clearTimer(entry);
     }
     entry.status = 'paused';
     entry.content = sanitizeContent(content);
     notify('upsert', entry);
-    return toPublicEntry(entry);
+    return publicEntry(entry);
   }
 
   function remove(id) {
@@ -132,7 +145,7 @@ export function createOutgoingQueue({ logger, onChange } = {}) {
   }
 
   function list() {
-    return [...entries.values()].map(toPublicEntry);
+    return [...entries.values()].map(publicEntry);
   }
 
   function shutdown() {
@@ -147,9 +160,10 @@ export function createOutgoingQueue({ logger, onChange } = {}) {
 }
 
 
-function toPublicEntry(entry) {
-  const remainingMs = entry.status === 'queued' && entry.deadlineAt
-    ? Math.max(0, entry.deadlineAt - Date.now())
+function toPublicEntry(entry, timestamp) {
+  const queued = entry.status === 'queued' && entry.deadline !== null;
+  const remainingMs = queued
+    ? Math.max(0, entry.deadline - timestamp)
     : Math.max(0, entry.remainingMs);
 
   return {
@@ -160,7 +174,7 @@ function toPublicEntry(entry) {
     source: entry.source,
     status: entry.status,
     createdAt: new Date(entry.createdAt).toISOString(),
-    deadlineAt: entry.deadlineAt ? new Date(entry.deadlineAt).toISOString() : null,
+    deadlineAt: queued ? new Date(Date.now() + remainingMs).toISOString() : null,
     remainingMs,
     remainingSeconds: Math.ceil(remainingMs / 1000),
   };
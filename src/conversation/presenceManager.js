@@ -4,8 +4,8 @@
  * Uses Baileys presence API where supported:
  * - sendPresenceUpdate('available') — come online
  * - readMessages(keys) — mark messages as read (blue ticks)
- * - sendPresenceUpdate('composing', jid) — show "typing..."
- * - sendPresenceUpdate('paused', jid) — stop typing indicator
+ * - sendPresenceUpdate('composing', remoteId) — show "typing..."
+ * - sendPresenceUpdate('paused', remoteId) — stop typing indicator
  * - sendPresenceUpdate('unavailable') — go offline
  *
  * Flow for each outbound reply:
@@ -33,7 +33,7 @@ import { getPresenceSettings } from '../persistence/settings.js';
  * @returns {object} PresenceManager API
  */
 export function createPresenceManager({ getTransport, logger }) {
-  // Track active idle timers per JID so we can cancel them
+  // Track active idle timers per remote ID so we can cancel them
   const idleTimers = new Map();
 
   function log(level, msg, meta) {
@@ -66,10 +66,8 @@ export function createPresenceManager({ getTransport, logger }) {
       return;
     }
 
-    const jid = remoteId.includes('@') ? remoteId : `${remoteId}@s.whatsapp.net`;
-
-    // Cancel any pending idle timer for this JID
-    cancelIdle(jid);
+    // Cancel any pending idle timer for this contact
+    cancelIdle(remoteId);
 
     try {
       // 1. Go online
@@ -87,7 +85,7 @@ export function createPresenceManager({ getTransport, logger }) {
       }
 
       // 3. Start typing
-      await transport.sendPresenceUpdate('composing', jid);
+      await transport.sendPresenceUpdate('composing', remoteId);
       log('debug', `Typing for ${remoteId}`);
 
       // 4. Typing duration based on message length
@@ -97,7 +95,7 @@ export function createPresenceManager({ getTransport, logger }) {
       }
 
       // 5. Stop typing indicator (message will be sent by caller immediately after)
-      await transport.sendPresenceUpdate('paused', jid);
+      await transport.sendPresenceUpdate('paused', remoteId);
 
     } catch (err) {
       // Presence failures should never block message delivery
@@ -117,9 +115,7 @@ export function createPresenceManager({ getTransport, logger }) {
     const transport = getTransport();
     if (!transport || typeof transport.sendPresenceUpdate !== 'function') return;
 
-    const jid = remoteId.includes('@') ? remoteId : `${remoteId}@s.whatsapp.net`;
-
-    cancelIdle(jid);
+    cancelIdle(remoteId);
 
     if (settings.idleAfterSend > 0) {
       const timer = setTimeout(async () => {
@@ -129,21 +125,21 @@ export function createPresenceManager({ getTransport, logger }) {
         } catch (err) {
           log('warn', `Failed to set unavailable: ${err.message}`);
         }
-        idleTimers.delete(jid);
+        idleTimers.delete(remoteId);
       }, settings.idleAfterSend);
 
-      idleTimers.set(jid, timer);
+      idleTimers.set(remoteId, timer);
     }
   }
 
   /**
    * Cancel a pending idle timer.
    */
-  function cancelIdle(jid) {
-    const timer = idleTimers.get(jid);
+  function cancelIdle(remoteId) {
+    const timer = idleTimers.get(remoteId);
     if (timer) {
       clearTimeout(timer);
-      idleTimers.delete(jid);
+      idleTimers.delete(remoteId);
     }
   }
 
@@ -1,11 +1,22 @@
-import { readFileSync } from 'node:fs';
+import { readFile } from 'node:fs/promises';
 import { join } from 'node:path';
+import { MEDIA_DIR } from '../media/storage.js';
 
 /**
  * System prompt assembly from per-conversation settings.
  * Uses canonical tone and flirt enums.
  */
 
+const MEDIA_PREFIX = '/media/';
+const MEDIA_CACHE_MAX_CHARS = 16 * 1024 * 1024; // base64 characters kept across prompts
+
+// Stored media files are write-once (unique names), so their encodings can be
+// reused while the same images stay in the history window. LRU by insertion order.
+const mediaCache = new Map(); // filePath → base64
+let mediaCacheChars = 0;
+let mediaCacheMaxChars = MEDIA_CACHE_MAX_CHARS;
+let mediaRoot = MEDIA_DIR;
+
 const TONE_DESCRIPTIONS = {
   professional: 'Respond in a professional, clear, and structured tone.',
   friendly: 'Respond in a friendly and approachable tone.',
@@ -20,6 +31,23 @@ const FLIRT_DESCRIPTIONS = {
   high: 'Be playfully flirtatious in your responses.',
 };
 
+/**
+ * Empty the stored-image cache and set where images are read from and how
+ * many base64 characters the cache may hold. Called without arguments it
+ * restores the defaults; tests use it to work on a temp directory and a
+ * small budget.
+ *
+ * @param {object} [opts]
+ * @param {string} [opts.mediaDir] — directory that /media/ paths resolve to
+ * @param {number} [opts.maxChars] — base64 characters kept across prompts
+ */
+export function configureMediaCache({ mediaDir = MEDIA_DIR, maxChars = MEDIA_CACHE_MAX_CHARS } = {}) {
+  mediaCache.clear();
+  mediaCacheChars = 0;
+  mediaCacheMaxChars = maxChars;
+  mediaRoot = mediaDir;
+}
+
 /**
  * Build the system prompt for a conversation.
  * Combines the custom system prompt, tone modifier, flirt modifier, and platform context.
@@ -76,13 +104,16 @@ export function buildSystemPrompt(conversation, config, approachContext = null)
  * - Audio/video/document: adds text description, actual content not sent to AI
  * - Images without stored files (download pending/failed): text description only
  *
+ * Stored images are read asynchronously and in parallel, so a history with
+ * several photos does not block the event loop while it is assembled.
+ *
  * @param {object} conversation — DB row
  * @param {Array<object>} recentMessages — From getRecentMessages (chronological order)
  * @param {object} config — App config
  * @param {object} [approachContext] — Optional approach message context
- * @returns {Array<{role: string, content: string|Array}>}
+ * @returns {Promise<Array<{role: string, content: string|Array}>>}
  */
-export function buildMessages(conversation, recentMessages, config, approachContext = null) {
+export async function buildMessages(conversation, recentMessages, config, approachContext = null) {
   const messages = [];
 
   // System prompt (with approach context if applicable)
@@ -95,12 +126,11 @@ export function buildMessages(conversation, recentMessages, config, approachCont
   const maxHistory = conversation.max_history ?? config.defaults?.maxHistory ?? 50;
   const trimmed = recentMessages.slice(-maxHistory);
 
-  for (const msg of trimmed) {
-    if (msg.role === 'user' || msg.role === 'assistant') {
-      const content = buildMessageContent(msg);
-      messages.push({ role: msg.role, content });
-    }
-  }
+  const history = trimmed.filter((msg) => msg.role === 'user' || msg.role === 'assistant');
+  const contents = await Promise.all(history.map(buildMessageContent));
+  history.forEach((msg, i) => {
+    messages.push({ role: msg.role, content: contents[i] });
+  });
 
   return messages;
 }
@@ -111,14 +141,14 @@ export function buildMessages(conversation, recentMessages, config, approachCont
  * For image messages with stored files, returns OpenAI vision content array.
  * For other media, returns text with media description appended.
  */
-function buildMessageContent(msg) {
+async function buildMessageContent(msg) {
   if (!msg.media_type) {
     return msg.content;
   }
 
   // Image with stored local file — use multimodal vision format
   if (msg.media_type === 'image' && msg.media_path) {
-    const base64 = readMediaAsBase64(msg.media_path);
+    const base64 = await readMediaAsBase64(msg.media_path);
     if (base64) {
       const mime = msg.media_mime_type || 'image/jpeg';
       const parts = [];
@@ -174,18 +204,39 @@ function buildMessageContent(msg) {
 /**
  * Read a stored media file as base64.
  * media_path is a serve path like /media/filename.jpg.
- * Returns base64 string or null on failure.
+ * Resolves to a base64 string, or null on failure.
  */
-function readMediaAsBase64(mediaPath) {
+async function readMediaAsBase64(mediaPath) {
   if (!mediaPath) return null;
 
   try {
-    // Convert serve path /media/filename.jpg to filesystem path data/media/filename.jpg
-    const fileName = mediaPath.replace(/^\/media\//, '');
-    const filePath = join(process.cwd(), 'data', 'media', fileName);
-    const buffer = readFileSync(filePath);
-    return buffer.toString('base64');
+    // Convert serve path /media/filename.jpg to its file under the shared media directory
+    const fileName = mediaPath.startsWith(MEDIA_PREFIX) ? mediaPath.slice(MEDIA_PREFIX.length) : mediaPath;
+    const filePath = join(mediaRoot, fileName);
+
+    const cached = mediaCache.get(filePath);
+    if (cached !== undefined) {
+      mediaCache.delete(filePath);
+      mediaCache.set(filePath, cached);
+      return cached;
+    }
+
+    const base64 = (await readFile(filePath)).toString('base64');
+    cacheMedia(filePath, base64);
+    return base64;
   } catch {
     return null;
   }
 }
+
+function cacheMedia(filePath, base64) {
+  if (base64.length > mediaCacheMaxChars || mediaCache.has(filePath)) return;
+
+  mediaCache.set(filePath, base64);
+  mediaCacheChars += base64.length;
+  while (mediaCacheChars > mediaCacheMaxChars) {
+    const [oldestPath, oldest] = mediaCache.entries().next().value;
+    mediaCache.delete(oldestPath);
+    mediaCacheChars -= oldest.length;
+  }
+}
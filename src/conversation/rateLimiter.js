@@ -0,0 +1,133 @@
+import { performance } from 'node:perf_hooks';
+
+const DEFAULT_CAPACITY = 5;
+const DEFAULT_REFILL_PER_SECOND = 0.5;
+const DEFAULT_MAX_KEYS = 10_000;
+const DEFAULT_IDLE_EVICT_MS = 10 * 60 * 1000;
+const DEFAULT_SWEEP_INTERVAL_MS = 5 * 60 * 1000;
+
+/**
+ * Create a per-key rate limiter (token bucket, implemented as GCRA).
+ *
+ * Each key may burst up to `capacity` actions; capacity refills continuously
+ * at `refillPerSecond`. The generic cell rate algorithm keeps the bucket as
+ * a single number per key — its theoretical arrival time (TAT) — so a
+ * check is one Map lookup and a comparison. Uses the monotonic clock so
+ * wall-clock steps (NTP corrections, manual changes) can neither drain nor
+ * overfill a bucket.
+ *
+ * Keys are kept in LRU order and capped at `maxKeys`. A key whose TAT is in
+ * the past has a full bucket and carries no information, so the oldest one
+ * is dropped opportunistically once it has been full for `idleEvictMs`.
+ * A background sweep (unref'd, so it never holds the process open) drops
+ * the rest, so keys from conversations that went quiet do not linger.
+ *
+ * @param {object} [opts]
+ * @param {number} [opts.capacity] — maximum burst size
+ * @param {number} [opts.refillPerSecond] — steady-state rate
+ * @param {number} [opts.maxKeys] — maximum number of tracked keys
+ * @param {number} [opts.idleEvictMs] — time a full bucket is kept before it may be dropped
+ * @param {number} [opts.sweepIntervalMs] — background sweep period; 0 disables it
+ * @param {function} [opts.now] — monotonic clock in ms (injectable for tests)
+ * @returns {object} Rate limiter
+ */
+export function createRateLimiter({
+  capacity = DEFAULT_CAPACITY,
+  refillPerSecond = DEFAULT_REFILL_PER_SECOND,
+  maxKeys = DEFAULT_MAX_KEYS,
+  idleEvictMs = DEFAULT_IDLE_EVICT_MS,
+  sweepIntervalMs = DEFAULT_SWEEP_INTERVAL_MS,
+  now = () => performance.now(),
+} = {}) {
+  // key → theoretical arrival time (ms), least recently used first
+  const arrivals = new Map();
+  // Time one token takes to refill, and how far ahead of now the TAT may run
+  const intervalMs = 1000 / refillPerSecond;
+  const burstMs = (capacity - 1) * intervalMs;
+
+  function touch(key, tat, timestamp) {
+    // Re-insert to move the key to the most-recently-used end
+    arrivals.delete(key);
+    arrivals.set(key, tat);
+
+    if (arrivals.size > maxKeys) {
+      arrivals.delete(arrivals.keys().next().value);
+      return;
+    }
+
+    const [oldestKey, oldestTat] = arrivals.entries().next().value;
+    if (oldestKey !== key && timestamp - oldestTat >= idleEvictMs) {
+      arrivals.delete(oldestKey);
+    }
+  }
+
+  /**
+   * Take one token for a key.
+   * @param {string} key
+   * @returns {boolean} true if allowed, false if rate-limited
+   */
+  function tryAcquire(key) {
+    const timestamp = now();
+    const tat = Math.max(arrivals.get(key) ?? timestamp, timestamp);
+
+    const allowed = tat - timestamp <= burstMs;
+    touch(key, allowed ? tat + intervalMs : tat, timestamp);
+    return allowed;
+  }
+
+  /**
+   * Time until tryAcquire() would next succeed for a key.
+   * @param {string} key
+   * @returns {number} milliseconds (0 if a token is available now)
+   */
+  function retryAfter(key) {
+    const tat = arrivals.get(key);
+    if (tat === undefined) return 0;
+    return Math.max(0, tat - burstMs - now());
+  }
+
+  /**
+   * Forget a key's bucket (next call starts with a full bucket).
+   */
+  function reset(key) {
+    arrivals.delete(key);
+  }
+
+  function size() {
+    return arrivals.size;
+  }
+
+  /**
+   * Drop every key whose bucket has been full for at least `idleEvictMs`.
+   * @returns {number} keys removed
+   */
+  function sweep() {
+    const timestamp = now();
+    let removed = 0;
+    for (const [key, tat] of arrivals) {
+      if (timestamp - tat >= idleEvictMs) {
+        arrivals.delete(key);
+        removed++;
+      }
+    }
+    return removed;
+  }
+
+  let sweepTimer = null;
+  if (sweepIntervalMs > 0) {
+    sweepTimer = setInterval(sweep, sweepIntervalMs);
+    sweepTimer.unref?.();
+  }
+
+  /**
+   * Stop the background sweep.
+   */
+  function shutdown() {
+    if (sweepTimer) {
+      clearInterval(sweepTimer);
+      sweepTimer = null;
+    }
+  }
+
+  return { tryAcquire, retryAfter, reset, size, sweep, shutdown };
+}
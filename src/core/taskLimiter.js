@@ -0,0 +1,46 @@
+/**
+ * Create a concurrency limiter for async tasks.
+ *
+ * At most `maxConcurrent` tasks run at once; the rest wait in FIFO order.
+ * Used to keep bursts of background work (e.g. media downloads) from
+ * all hitting the network and disk at the same time.
+ *
+ * @param {number} maxConcurrent — maximum number of tasks running at once
+ * @returns {object} Task limiter
+ */
+export function createTaskLimiter(maxConcurrent) {
+  const waiting = [];
+  let active = 0;
+
+  function next() {
+    if (active >= maxConcurrent || waiting.length === 0) return;
+
+    const { task, resolve, reject } = waiting.shift();
+    active++;
+    Promise.resolve()
+      .then(task)
+      .then(resolve, reject)
+      .finally(() => {
+        active--;
+        next();
+      });
+  }
+
+  /**
+   * Run a task once a slot is free.
+   * @param {function(): Promise<*>} task
+   * @returns {Promise<*>} Resolves/rejects with the task's result
+   */
+  function run(task) {
+    return new Promise((resolve, reject) => {
+      waiting.push({ task, resolve, reject });
+      next();
+    });
+  }
+
+  function getStats() {
+    return { active, waiting: waiting.length };
+  }
+
+  return { run, getStats };
+}
@@ -64,12 +64,15 @@ async function main() {
   const aiProvider = createAIProvider({ ...config, logger: fastify.log });
 
   if (config.ai.openaiApiKey) {
-    const testResult = await aiProvider.testConnection();
-    if (testResult.success) {
-      fastify.log.info(`AI provider connected (model: ${testResult.model})`);
-    } else {
-      fastify.log.warn(`AI provider connection failed: ${testResult.error}`);
-    }
+    // The probe only records connection status and logs it — run it in the
+    // background so a slow or unreachable API does not hold up startup.
+    aiProvider.testConnection().then((testResult) => {
+      if (testResult.success) {
+        fastify.log.info(`AI provider connected (model: ${testResult.model})`);
+      } else {
+        fastify.log.warn(`AI provider connection failed: ${testResult.error}`);
+      }
+    });
   } else {
     fastify.log.warn('AI provider not configured — no API key set');
   }
@@ -88,8 +91,11 @@ async function main() {
   fastify.log.info('Conversation orchestrator initialized (with delay + presence)');
 
   // ── 7. Initialize WhatsApp transport ─────────────────────────────────────
+  // Transport setup (adapter load, auth state, version lookup) overlaps with
+  // the steps below and is awaited together with the Telegram admin. Routes
+  // only look the transport up per request, after listen().
   transportManager = createTransportManager(config, orchestrator, io, fastify.log);
-  await transportManager.initialize();
+  const transportReady = transportManager.initialize();
 
   // ── 8. Register routes ───────────────────────────────────────────────────
   fastify.register(healthRoutes, { config, aiProvider, transportManager, orchestrator });
@@ -110,11 +116,12 @@ async function main() {
   let telegramAdmin = null;
   if (config.telegram.enabled && config.telegram.botToken) {
     telegramAdmin = createTelegramAdmin(config, transportManager, aiProvider, fastify.log);
-    await telegramAdmin.initialize();
   } else {
     fastify.log.info('Telegram admin disabled');
   }
 
+  await Promise.all([transportReady, telegramAdmin?.initialize()]);
+
   // ── 10. Graceful shutdown ────────────────────────────────────────────────
   let shuttingDown = false;
 
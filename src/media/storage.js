@@ -1,6 +1,5 @@
-import { mkdirSync, writeFileSync, existsSync } from 'node:fs';
+import { mkdir, writeFile } from 'node:fs/promises';
 import { join, extname } from 'node:path';
-import { randomUUID } from 'node:crypto';
 
 /**
  * Media storage — downloads and stores media files to data/media/.
@@ -13,10 +12,13 @@ import { randomUUID } from 'node:crypto';
  * 4. On failure, caller logs error and moves on
  */
 
-const MEDIA_DIR = join(process.cwd(), 'data', 'media');
+export const MEDIA_DIR = join(process.cwd(), 'data', 'media');
+
+// Per-process counter — combined with the timestamp it keeps filenames unique across bursts and restarts
+let fileSequence = 0;
 
 // Common MIME → extension mapping
-const MIME_EXTENSIONS = {
+const MIME_EXTENSIONS = Object.freeze({
   'image/jpeg': '.jpg',
   'image/png': '.png',
   'image/gif': '.gif',
@@ -31,15 +33,34 @@ const MIME_EXTENSIONS = {
   'application/pdf': '.pdf',
   'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
   'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
-};
+});
+
+// Extension used when neither the MIME type nor the original name gives one
+const MEDIA_TYPE_EXTENSIONS = Object.freeze({
+  image: '.jpg',
+  audio: '.ogg',
+  video: '.mp4',
+  document: '.bin',
+});
+
+// Reverse lookup (extension → MIME), derived once from the table above
+const EXTENSION_MIMES = Object.freeze(Object.fromEntries(
+  Object.entries(MIME_EXTENSIONS).map(([mime, ext]) => [ext, mime]),
+));
+
+// Directory creation is done once per process; a failed attempt is retried on the next call
+let mediaDirReady = null;
 
 /**
  * Ensure data/media/ directory exists.
+ * @returns {Promise<void>}
  */
 export function ensureMediaDir() {
-  if (!existsSync(MEDIA_DIR)) {
-    mkdirSync(MEDIA_DIR, { recursive: true });
-  }
+  mediaDirReady ??= mkdir(MEDIA_DIR, { recursive: true }).then(() => undefined, (err) => {
+    mediaDirReady = null;
+    throw err;
+  });
+  return mediaDirReady;
 }
 
 /**
@@ -51,26 +72,32 @@ export function ensureMediaDir() {
  * @param {string} [opts.mimeType] — MIME type if known
  * @param {string} [opts.originalName] — original filename if available
  * @param {number} [opts.messageId] — message ID for filename
+ * @param {number} [opts.expectedSizeBytes] — size declared by the platform; shorter buffers are rejected
  * @returns {Promise<{ fileName: string, filePath: string, servePath: string, mimeType: string, sizeBytes: number }>}
  */
-export async function downloadAndStore({ download, mediaType, mimeType, originalName, messageId }) {
-  ensureMediaDir();
+export async function downloadAndStore({ download, mediaType, mimeType, originalName, messageId, expectedSizeBytes }) {
+  await ensureMediaDir();
 
   const buffer = await download();
   if (!buffer || buffer.length === 0) {
     throw new Error('Downloaded media is empty');
   }
 
+  // A buffer shorter than the declared size is a truncated or thumbnail-only download
+  if (expectedSizeBytes && buffer.length < expectedSizeBytes) {
+    throw new Error(`Downloaded media is truncated (${buffer.length} of ${expectedSizeBytes} bytes) — likely thumbnail only`);
+  }
+
   // Determine extension
   const ext = getExtension(mimeType, originalName, mediaType);
 
-  // Generate unique filename: {messageId}_{uuid}{ext}
+  // Generate unique filename: {messageId}_{timestamp}-{sequence}{ext}
   const prefix = messageId ? `${messageId}_` : '';
-  const fileName = `${prefix}${randomUUID().slice(0, 8)}${ext}`;
+  const fileName = `${prefix}${Date.now().toString(36)}-${(++fileSequence).toString(36)}${ext}`;
   const filePath = join(MEDIA_DIR, fileName);
 
-  // Write file synchronously — small files, no async needed
-  writeFileSync(filePath, buffer);
+  // Write asynchronously — videos and documents can be large enough to stall the event loop
+  await writeFile(filePath, buffer);
 
   // Detect MIME from content if not provided
   const resolvedMime = mimeType || guessMimeFromExtension(ext) || 'application/octet-stream';
@@ -100,23 +127,14 @@ function getExtension(mimeType, originalName, mediaType) {
   }
 
   // Fallback by media type
-  const fallbacks = {
-    image: '.jpg',
-    audio: '.ogg',
-    video: '.mp4',
-    document: '.bin',
-  };
-  return fallbacks[mediaType] || '.bin';
+  return MEDIA_TYPE_EXTENSIONS[mediaType] || '.bin';
 }
 
 /**
  * Guess MIME from extension (reverse lookup).
  */
 function guessMimeFromExtension(ext) {
-  for (const [mime, e] of Object.entries(MIME_EXTENSIONS)) {
-    if (e === ext) return mime;
-  }
-  return null;
+  return EXTENSION_MIMES[ext.toLowerCase()] ?? null;
 }
 
 /**
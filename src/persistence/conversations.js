@@ -17,9 +17,10 @@ export function createConversation({ platform, remoteId, displayName = '', defau
   const stmt = db.prepare(`
     INSERT INTO conversations (id, platform, remote_id, display_name, system_prompt, tone, flirt, temperature, max_tokens, max_history, auto_reply, preset_id, first_message_sent_manually, last_message_at)
     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    RETURNING *
   `);
 
-  stmt.run(
+  return stmt.get(
     id,
     platform,
     remoteId,
@@ -34,8 +35,6 @@ export function createConversation({ platform, remoteId, displayName = '', defau
     defaults.preset_id ?? null,
     0,
   );
-
-  return getConversation(id);
 }
 
 /**
@@ -111,11 +110,8 @@ export function updateConversationSettings(id, settings) {
   updates.push("updated_at = datetime('now')");
   values.push(id);
 
-  const sql = `UPDATE conversations SET ${updates.join(', ')} WHERE id = ?`;
-  const result = db.prepare(sql).run(...values);
-
-  if (result.changes === 0) return null;
-  return getConversation(id);
+  const sql = `UPDATE conversations SET ${updates.join(', ')} WHERE id = ? RETURNING *`;
+  return db.prepare(sql).get(...values) ?? null;
 }
 
 /**
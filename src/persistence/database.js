@@ -3,6 +3,8 @@ import { mkdirSync } from 'node:fs';
 import { dirname } from 'node:path';
 import { runMigrations } from './schema.js';
 
+const IN_MEMORY_PATH = ':memory:';
+
 let db = null;
 
 /**
@@ -13,8 +15,10 @@ let db = null;
 export function initDatabase(config) {
   const dbPath = config.databasePath;
 
-  // Ensure parent directory exists
-  mkdirSync(dirname(dbPath), { recursive: true });
+  // Ensure parent directory exists (in-memory databases have no file)
+  if (dbPath !== IN_MEMORY_PATH) {
+    mkdirSync(dirname(dbPath), { recursive: true });
+  }
 
   db = new Database(dbPath);
 
@@ -44,6 +48,16 @@ export function getDatabase() {
   return db;
 }
 
+/**
+ * Run `fn` inside a single transaction so its writes share one commit.
+ * Nested calls become savepoints; an exception rolls everything back.
+ * @param {function(): *} fn
+ * @returns {*} fn's return value
+ */
+export function runInTransaction(fn) {
+  return db.transaction(fn)();
+}
+
 /**
  * Close the database connection cleanly.
  */
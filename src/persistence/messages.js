@@ -9,12 +9,13 @@ export function addMessage(conversationId, role, content, opts = {}) {
   const stmt = db.prepare(`
     INSERT INTO messages (conversation_id, role, content, direction, media_type, media_url, media_path, media_mime_type, media_size_bytes, media_metadata, token_count, platform_message_id, delivery_status, delivery_error)
     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING *
   `);
 
   const direction = opts.direction ?? (role === 'user' ? 'inbound' : 'outbound');
   const deliveryStatus = opts.delivery_status ?? (direction === 'outbound' ? 'queued' : null);
 
-  const info = stmt.run(
+  return stmt.get(
     conversationId,
     role,
     content,
@@ -30,8 +31,6 @@ export function addMessage(conversationId, role, content, opts = {}) {
     deliveryStatus,
     opts.delivery_error ?? null,
   );
-
-  return db.prepare('SELECT * FROM messages WHERE id = ?').get(info.lastInsertRowid);
 }
 
 
@@ -40,10 +39,9 @@ export function addMessage(conversationId, role, content, opts = {}) {
  */
 export function updateMessageContent(messageId, content) {
   const db = getDatabase();
-  db.prepare(
-    'UPDATE messages SET content = ? WHERE id = ?'
-  ).run(content, messageId);
-  return db.prepare('SELECT * FROM messages WHERE id = ?').get(messageId) ?? null;
+  return db.prepare(
+    'UPDATE messages SET content = ? WHERE id = ? RETURNING *'
+  ).get(content, messageId) ?? null;
 }
 
 /**
@@ -51,10 +49,9 @@ export function updateMessageContent(messageId, content) {
  */
 export function updateDeliveryStatus(messageId, status, error = null) {
   const db = getDatabase();
-  db.prepare(
-    'UPDATE messages SET delivery_status = ?, delivery_error = ? WHERE id = ?'
-  ).run(status, error, messageId);
-  return db.prepare('SELECT * FROM messages WHERE id = ?').get(messageId) ?? null;
+  return db.prepare(
+    'UPDATE messages SET delivery_status = ?, delivery_error = ? WHERE id = ? RETURNING *'
+  ).get(status, error, messageId) ?? null;
 }
 
 /**
@@ -131,17 +128,17 @@ export function getTotalMessageCount() {
  */
 export function updateMessageMedia(messageId, media) {
   const db = getDatabase();
-  db.prepare(`
+  return db.prepare(`
     UPDATE messages
     SET media_path = ?, media_mime_type = ?, media_size_bytes = ?
     WHERE id = ?
-  `).run(
+    RETURNING *
+  `).get(
     media.media_path ?? null,
     media.media_mime_type ?? null,
     media.media_size_bytes ?? null,
     messageId,
-  );
-  return db.prepare('SELECT * FROM messages WHERE id = ?').get(messageId) ?? null;
+  ) ?? null;
 }
 
 /**
@@ -155,9 +152,10 @@ export function addMediaMetadata(messageId, metadata) {
       original_url, thumbnail_path, transcription, analysis,
       duration_seconds, width, height
     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING *
   `);
 
-  const info = stmt.run(
+  return stmt.get(
     messageId,
     metadata.media_type ?? null,
     metadata.mime_type ?? null,
@@ -171,8 +169,6 @@ export function addMediaMetadata(messageId, metadata) {
     metadata.width ?? null,
     metadata.height ?? null,
   );
-
-  return db.prepare('SELECT * FROM media_metadata WHERE id = ?').get(info.lastInsertRowid);
 }
 
 /**
@@ -1,5 +1,5 @@
 import { randomUUID } from 'node:crypto';
-import { DEFAULT_LOCAL_AI_BASE_URL, DEFAULT_LOCAL_AI_MODEL, DEFAULT_WEB_SEARCH_PROVIDER, getDefaultEphemeralMcpIntegrations } from '../core/mcpIntegrations.js';
+import { DEFAULT_LOCAL_AI_BASE_URL, DEFAULT_LOCAL_AI_MODEL } from '../core/mcpIntegrations.js';
 
 /**
  * Database schema and migrations.
@@ -59,6 +59,18 @@ function getSchemaVersion(db) {
   }
 }
 
+/**
+ * Add a column if it doesn't exist yet. Only SQLite's "duplicate column"
+ * error is swallowed — anything else is a real migration failure.
+ */
+function addColumn(db, table, column, definition) {
+  try {
+    db.exec(`ALTER TABLE ${table} ADD COLUMN ${column} ${definition}`);
+  } catch (err) {
+    if (!/duplicate column name/i.test(err.message)) throw err;
+  }
+}
+
 // ── Schema v1 (original) ───────────────────────────────────────────────────
 
 function runV1(db) {
@@ -127,34 +139,25 @@ function runV1(db) {
 // ── Schema v2 (delivery tracking, presets, settings, extended fields) ──────
 
 function runV2(db) {
-  // Helper: add column if it doesn't exist
-  function addColumn(table, column, definition) {
-    try {
-      db.exec(`ALTER TABLE ${table} ADD COLUMN ${column} ${definition}`);
-    } catch {
-      // Column already exists — ignore
-    }
-  }
-
   // ── Extend conversations ───────────────────────────────────────────────
-  addColumn('conversations', 'first_message_sent_manually', 'INTEGER NOT NULL DEFAULT 0');
-  addColumn('conversations', 'preset_id', 'TEXT');
-  addColumn('conversations', 'ai_provider', 'TEXT');
-  addColumn('conversations', 'ai_base_url', 'TEXT');
-  addColumn('conversations', 'ai_model', 'TEXT');
-  addColumn('conversations', 'profile_photo_url', 'TEXT');
-  addColumn('conversations', 'reply_delay_min', 'INTEGER');
-  addColumn('conversations', 'reply_delay_max', 'INTEGER');
-  addColumn('conversations', 'last_message_at', "TEXT");
+  addColumn(db, 'conversations', 'first_message_sent_manually', 'INTEGER NOT NULL DEFAULT 0');
+  addColumn(db, 'conversations', 'preset_id', 'TEXT');
+  addColumn(db, 'conversations', 'ai_provider', 'TEXT');
+  addColumn(db, 'conversations', 'ai_base_url', 'TEXT');
+  addColumn(db, 'conversations', 'ai_model', 'TEXT');
+  addColumn(db, 'conversations', 'profile_photo_url', 'TEXT');
+  addColumn(db, 'conversations', 'reply_delay_min', 'INTEGER');
+  addColumn(db, 'conversations', 'reply_delay_max', 'INTEGER');
+  addColumn(db, 'conversations', 'last_message_at', "TEXT");
 
   // ── Extend messages ────────────────────────────────────────────────────
-  addColumn('messages', 'direction', "TEXT NOT NULL DEFAULT 'inbound'");
-  addColumn('messages', 'delivery_status', "TEXT");
-  addColumn('messages', 'delivery_error', 'TEXT');
-  addColumn('messages', 'media_path', 'TEXT');
-  addColumn('messages', 'media_mime_type', 'TEXT');
-  addColumn('messages', 'media_size_bytes', 'INTEGER');
-  addColumn('messages', 'media_metadata', 'TEXT');
+  addColumn(db, 'messages', 'direction', "TEXT NOT NULL DEFAULT 'inbound'");
+  addColumn(db, 'messages', 'delivery_status', "TEXT");
+  addColumn(db, 'messages', 'delivery_error', 'TEXT');
+  addColumn(db, 'messages', 'media_path', 'TEXT');
+  addColumn(db, 'messages', 'media_mime_type', 'TEXT');
+  addColumn(db, 'messages', 'media_size_bytes', 'INTEGER');
+  addColumn(db, 'messages', 'media_metadata', 'TEXT');
 
   // ── presets table ──────────────────────────────────────────────────────
   db.exec(`
@@ -222,39 +225,19 @@ function runV2(db) {
 }
 
 function runV3(db) {
-  function addColumn(table, column, definition) {
-    try {
-      db.exec(`ALTER TABLE ${table} ADD COLUMN ${column} ${definition}`);
-    } catch {
-      // Column already exists — ignore
-    }
-  }
-
-  addColumn('conversations', 'use_global_ai', 'INTEGER NOT NULL DEFAULT 1');
-  addColumn('conversations', 'use_global_delay', 'INTEGER NOT NULL DEFAULT 1');
+  addColumn(db, 'conversations', 'use_global_ai', 'INTEGER NOT NULL DEFAULT 1');
+  addColumn(db, 'conversations', 'use_global_delay', 'INTEGER NOT NULL DEFAULT 1');
 }
 
 function runV4(db) {
-  try {
-    db.exec("ALTER TABLE conversations ADD COLUMN ai_history_mode TEXT NOT NULL DEFAULT 'partial'");
-  } catch {
-    // Column already exists — ignore
-  }
+  addColumn(db, 'conversations', 'ai_history_mode', "TEXT NOT NULL DEFAULT 'partial'");
 }
 
 function runV5(db) {
-  function addColumn(table, column, definition) {
-    try {
-      db.exec(`ALTER TABLE ${table} ADD COLUMN ${column} ${definition}`);
-    } catch {
-      // Column already exists — ignore
-    }
-  }
-
   // AI approach/follow-up feature
-  addColumn('conversations', 'ai_approach_enabled', 'INTEGER NOT NULL DEFAULT 0');
-  addColumn('conversations', 'ai_approach_max_messages', 'INTEGER NOT NULL DEFAULT 3');
-  addColumn('conversations', 'ai_approach_delay_minutes', 'INTEGER NOT NULL DEFAULT 10');
+  addColumn(db, 'conversations', 'ai_approach_enabled', 'INTEGER NOT NULL DEFAULT 0');
+  addColumn(db, 'conversations', 'ai_approach_max_messages', 'INTEGER NOT NULL DEFAULT 3');
+  addColumn(db, 'conversations', 'ai_approach_delay_minutes', 'INTEGER NOT NULL DEFAULT 10');
 }
 
 function runV6(db) {
@@ -1,5 +1,35 @@
 import { getDatabase } from './database.js';
 
+// Parsed presence settings — read on every outbound reply, written only from the GUI.
+// Reused for as long as the settings version stays the same.
+let presenceCache = null; // { version, settings }
+
+// Bumped on every settings write so callers can memoize derived state cheaply
+let settingsVersion = 0;
+let versionDb = null;
+
+const DELAY_SETTING_KEYS = ['reply_delay_min', 'reply_delay_max'];
+const PRESENCE_SETTING_KEYS = [
+  'presence_enabled',
+  'presence_read_delay',
+  'presence_typing_speed',
+  'presence_min_typing',
+  'presence_max_typing',
+  'presence_idle_after_send',
+];
+const TRUTHY_VALUES = new Set(['1', 'true', 'yes', 'on']);
+
+function parseIntValue(val, fallback) {
+  if (val == null) return fallback;
+  const parsed = parseInt(val, 10);
+  return Number.isNaN(parsed) ? fallback : parsed;
+}
+
+function parseBoolValue(val, fallback) {
+  if (val == null) return fallback;
+  return TRUTHY_VALUES.has(val.toLowerCase());
+}
+
 /**
  * Get a single setting value. Returns string or null.
  */
@@ -13,19 +43,33 @@ export function getSetting(key) {
  * Get a setting as integer.
  */
 export function getSettingInt(key, fallback = 0) {
-  const val = getSetting(key);
-  if (val === null) return fallback;
-  const parsed = parseInt(val, 10);
-  return Number.isNaN(parsed) ? fallback : parsed;
+  return parseIntValue(getSetting(key), fallback);
 }
 
 /**
  * Get a setting as boolean (truthy: '1', 'true', 'yes').
  */
 export function getSettingBool(key, fallback = false) {
-  const val = getSetting(key);
-  if (val === null) return fallback;
-  return ['1', 'true', 'yes', 'on'].includes(val.toLowerCase());
+  return parseBoolValue(getSetting(key), fallback);
+}
+
+function invalidateCaches() {
+  settingsVersion++;
+}
+
+/**
+ * Version stamp of the settings table. Changes whenever a setting is written
+ * (or a different database instance is opened), so derived values can be
+ * reused for as long as it stays the same.
+ * @returns {number}
+ */
+export function getSettingsVersion() {
+  const db = getDatabase();
+  if (db !== versionDb) {
+    versionDb = db;
+    settingsVersion++;
+  }
+  return settingsVersion;
 }
 
 /**
@@ -37,6 +81,7 @@ export function setSetting(key, value) {
     INSERT OR REPLACE INTO settings (key, value, updated_at)
     VALUES (?, ?, datetime('now'))
   `).run(key, String(value));
+  invalidateCaches();
 }
 
 /**
@@ -83,6 +128,7 @@ export function setSettingsBulk(settings) {
   });
 
   run();
+  invalidateCaches();
 }
 
 /**
@@ -91,8 +137,9 @@ export function setSettingsBulk(settings) {
  * Enforces minimum 3000ms.
  */
 export function getDelaySettings(conversation = null) {
-  const globalMin = getSettingInt('reply_delay_min', 3000);
-  const globalMax = getSettingInt('reply_delay_max', 8000);
+  const values = getSettingsBulk(DELAY_SETTING_KEYS);
+  const globalMin = parseIntValue(values.reply_delay_min, 3000);
+  const globalMax = parseIntValue(values.reply_delay_max, 8000);
 
   const useGlobalDelay = conversation?.use_global_delay === undefined
     ? true
@@ -110,14 +157,22 @@ export function getDelaySettings(conversation = null) {
 
 /**
  * Get presence simulation settings.
+ * Cached between settings writes; the returned object is frozen.
  */
 export function getPresenceSettings() {
-  return {
-    enabled: getSettingBool('presence_enabled', true),
-    readDelay: getSettingInt('presence_read_delay', 1500),
-    typingSpeed: getSettingInt('presence_typing_speed', 40),
-    minTyping: getSettingInt('presence_min_typing', 2000),
-    maxTyping: getSettingInt('presence_max_typing', 10000),
-    idleAfterSend: getSettingInt('presence_idle_after_send', 3000),
-  };
+  const version = getSettingsVersion();
+  if (presenceCache?.version === version) return presenceCache.settings;
+
+  // One query for the whole group instead of one per key
+  const values = getSettingsBulk(PRESENCE_SETTING_KEYS);
+  const settings = Object.freeze({
+    enabled: parseBoolValue(values.presence_enabled, true),
+    readDelay: parseIntValue(values.presence_read_delay, 1500),
+    typingSpeed: parseIntValue(values.presence_typing_speed, 40),
+    minTyping: parseIntValue(values.presence_min_typing, 2000),
+    maxTyping: parseIntValue(values.presence_max_typing, 10000),
+    idleAfterSend: parseIntValue(values.presence_idle_after_send, 3000),
+  });
+  presenceCache = { version, settings };
+  return settings;
 }
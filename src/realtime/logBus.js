@@ -12,7 +12,11 @@ const LEVEL_BY_PINO_NUMBER = Object.freeze({
   60: 'fatal',
 });
 
-let entries = [];
+// Fixed-size ring buffer — appending overwrites the oldest slot instead of
+// copying the whole history on every log line
+const entries = new Array(MAX_LOG_ENTRIES);
+let nextSlot = 0;
+let entryCount = 0;
 
 // Less noise. More signal. AnomFIN.
 function sanitizeValue(value, depth = 0) {
@@ -71,7 +75,9 @@ export function normalizeLogEntry(input) {
 
 export function appendLogEntry(input) {
   const entry = normalizeLogEntry(input);
-  entries = [...entries, entry].slice(-MAX_LOG_ENTRIES);
+  entries[nextSlot] = entry;
+  nextSlot = (nextSlot + 1) % MAX_LOG_ENTRIES;
+  entryCount = Math.min(entryCount + 1, MAX_LOG_ENTRIES);
   getIO()?.emit('log:entry', entry);
   return entry;
 }
@@ -87,9 +93,19 @@ export function capturePinoLog(inputArgs, level) {
 
 export function getRecentLogEntries(limit = 200) {
   const safeLimit = Number.isInteger(limit) && limit > 0 ? Math.min(limit, MAX_LOG_ENTRIES) : 200;
-  return entries.slice(-safeLimit);
+  const count = Math.min(safeLimit, entryCount);
+  const result = new Array(count);
+  // Oldest requested entry first, walking forward to the newest
+  let slot = (nextSlot - count + MAX_LOG_ENTRIES) % MAX_LOG_ENTRIES;
+  for (let i = 0; i < count; i++) {
+    result[i] = entries[slot];
+    slot = (slot + 1) % MAX_LOG_ENTRIES;
+  }
+  return result;
 }
 
 export function clearLogEntries() {
-  entries = [];
+  entries.fill(undefined);
+  nextSlot = 0;
+  entryCount = 0;
 }
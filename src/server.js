@@ -1,4 +1,4 @@
-import { existsSync, mkdirSync } from 'node:fs';
+import { existsSync } from 'node:fs';
 import { join, dirname } from 'node:path';
 import { fileURLToPath } from 'node:url';
 import Fastify from 'fastify';
@@ -6,10 +6,10 @@ import cors from '@fastify/cors';
 import formbody from '@fastify/formbody';
 import fastifyStatic from '@fastify/static';
 import { capturePinoLog } from './realtime/logBus.js';
+import { MEDIA_DIR, ensureMediaDir } from './media/storage.js';
 
 const __dirname = dirname(fileURLToPath(import.meta.url));
 const WEB_DIST = join(__dirname, '../web/dist');
-const MEDIA_DIR = join(process.cwd(), 'data', 'media');
 const JSON_BODY_LIMIT_BYTES = 8 * 1024 * 1024;
 
 /**
@@ -24,7 +24,8 @@ export function createServer(config) {
       transport: {
         target: 'pino-pretty',
         options: {
-          colorize: true,
+          // ANSI colors only for a terminal — piped/redirected logs stay plain text
+          colorize: Boolean(process.stdout.isTTY),
           translateTime: 'SYS:yyyy-mm-dd HH:MM:ss',
           ignore: 'pid,hostname',
         },
@@ -42,12 +43,15 @@ export function createServer(config) {
   fastify.register(cors, { origin: true });
   fastify.register(formbody);
 
-  // Serve React GUI build if it exists (registered first to provide reply.sendFile)
+  // Serve React GUI build if it exists (registered first to provide reply.sendFile).
+  // The build does not change while the server runs, so its files are listed once
+  // at startup and get a route each — SPA paths go straight to the fallback below
+  // instead of costing a failed stat per request.
   if (existsSync(join(WEB_DIST, 'index.html'))) {
     fastify.register(fastifyStatic, {
       root: WEB_DIST,
       prefix: '/',
-      wildcard: true,
+      wildcard: false,
     });
 
     // SPA fallback: non-API routes serve index.html
@@ -72,14 +76,17 @@ export function createServer(config) {
     });
   }
 
-  // Serve stored media files at /media/{filename} (decorateReply:false since static already registered above)
-  mkdirSync(MEDIA_DIR, { recursive: true });
-  fastify.register(fastifyStatic, {
-    root: MEDIA_DIR,
-    prefix: '/media/',
-    decorateReply: false,
-    cacheControl: true,
-    maxAge: 86400000, // 24h cache
+  // Serve stored media files at /media/{filename} (decorateReply:false since static already registered above).
+  // Shares storage's one-time directory creation, so downloads never repeat the mkdir.
+  fastify.register(async (instance) => {
+    await ensureMediaDir();
+    await instance.register(fastifyStatic, {
+      root: MEDIA_DIR,
+      prefix: '/media/',
+      decorateReply: false,
+      cacheControl: true,
+      maxAge: 86400000, // 24h cache
+    });
   });
 
   return fastify;
@@ -57,9 +57,9 @@ export class TransportAdapter extends EventEmitter {
    * Send presence update (online, typing, etc.).
    * Not all transports support this — default is no-op.
    * @param {string} type — 'available' | 'unavailable' | 'composing' | 'paused'
-   * @param {string} [jid] — recipient JID (required for composing/paused)
+   * @param {string} [remoteId] — recipient remote_id; each transport maps it to its own address format
    */
-  async sendPresenceUpdate(type, jid) {
+  async sendPresenceUpdate(type, remoteId) {
     // No-op by default
   }
 
@@ -72,6 +72,16 @@ export class TransportAdapter extends EventEmitter {
     // No-op by default
   }
 
+  /**
+   * Forget an inbound message so a redelivery of it is processed again.
+   * Called when handling the message failed.
+   * Not all transports de-duplicate inbound messages — default is no-op.
+   * @param {object} messageKey — transport-specific message key
+   */
+  forgetInbound(messageKey) {
+    // No-op by default
+  }
+
   /**
    * Fetch profile photo URL for a contact.
    * Not all transports support this — default returns null.
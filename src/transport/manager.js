@@ -1,5 +1,3 @@
-import { WhatsAppCloudTransport } from './whatsappCloud.js';
-import { WhatsAppBaileysTransport } from './whatsappBaileys.js';
 import { TRANSPORT_STATES } from './base.js';
 
 /**
@@ -29,13 +27,16 @@ export function createTransportManager(config, orchestrator, io, logger) {
 
   /**
    * Create the appropriate transport adapter based on WHATSAPP_MODE.
+   * Only the selected adapter's module is loaded.
    */
-  function createTransport() {
+  async function createTransport() {
     const mode = config.whatsapp.mode;
 
     if (mode === 'cloud_api') {
+      const { WhatsAppCloudTransport } = await import('./whatsappCloud.js');
       transport = new WhatsAppCloudTransport(config);
     } else if (mode === 'baileys') {
+      const { WhatsAppBaileysTransport } = await import('./whatsappBaileys.js');
       transport = new WhatsAppBaileysTransport(config);
     } else {
       throw new Error(`Unknown WHATSAPP_MODE: ${mode}`);
@@ -65,6 +66,8 @@ export function createTransportManager(config, orchestrator, io, logger) {
         );
       } catch (err) {
         log('error', `Error handling inbound message: ${err.message}`, { err });
+        // Let a redelivery of this message through instead of treating it as seen
+        transport?.forgetInbound(messageKey);
       }
     });
 
@@ -86,13 +89,28 @@ export function createTransportManager(config, orchestrator, io, logger) {
         io.emit('transport:qr', { qrDataUrl });
       }
     });
+
+    // Replay the pending QR to GUI clients that connect (or open the QR view)
+    // between rotations instead of leaving them blank for up to ~20s
+    if (io && typeof transport.getQrDataUrl === 'function') {
+      io.on('connection', (socket) => {
+        const sendPendingQr = () => {
+          const qrDataUrl = transport?.getQrDataUrl();
+          if (qrDataUrl) {
+            socket.emit('transport:qr', { qrDataUrl });
+          }
+        };
+        sendPendingQr();
+        socket.on('transport:qr:request', sendPendingQr);
+      });
+    }
   }
 
   /**
    * Initialize: create transport, wire events, start it.
    */
   async function initialize() {
-    createTransport();
+    await createTransport();
     wireEvents();
 
     try {
@@ -0,0 +1,271 @@
+import { readFile, rename, writeFile } from 'node:fs/promises';
+
+/**
+ * Inbound message de-duplication.
+ *
+ * Two tiers: an exact LRU of the most recent IDs answers with certainty,
+ * and a rotating Bloom filter remembers roughly the last 10–20k IDs —
+ * ten times as many — in a fixed 256 KB. An ID found only in the Bloom
+ * filter (it aged out of the LRU) is treated as a duplicate. The price is
+ * a false positive, i.e. a genuinely new message dropped, at a rate of
+ * about 4 in a million at full load with the default sizing.
+ *
+ * State can be persisted to a JSON file so a restart does not answer
+ * messages that WhatsApp redelivers after reconnecting.
+ */
+
+// 2^20 bits, 4 hashes, 10k IDs per generation → ~2e-6 false positives per
+// generation (~4e-6 across both); must be a power of two
+const DEFAULT_BLOOM_BITS = 1 << 20;
+const DEFAULT_BLOOM_HASHES = 4;
+const DEFAULT_BLOOM_CAPACITY = 10000; // inserts per generation before rotating
+const DEFAULT_EXACT_LIMIT = 2048;
+const DEFAULT_CHECKPOINT_EVERY = 500; // inserts between background saves
+const STATE_VERSION = 3; // v3: Bloom hits count on their own; forgotten IDs persisted
+const SECOND_HASH_SEED = 0x9e3779b9;
+
+/**
+ * 32-bit FNV-1a hash with a seeded offset basis.
+ * @param {string} value
+ * @param {number} seed
+ * @returns {number}
+ */
+function fnv1a(value, seed) {
+  let hash = (0x811c9dc5 ^ seed) >>> 0;
+  for (let i = 0; i < value.length; i++) {
+    hash ^= value.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+/**
+ * Create a two-generation rotating Bloom filter over string keys.
+ *
+ * Inserts go to the active generation; lookups check both. Once the
+ * active generation reaches its design capacity it becomes the passive
+ * one and a fresh array takes its place, so the false-positive rate
+ * stays bounded over long sessions and memory never exceeds 2 × bits.
+ *
+ * Bit positions come from two FNV-1a passes combined by double hashing
+ * (Kirsch–Mitzenmacher: h1 + i·h2), which keeps the false-positive rate
+ * of k independent hashes while hashing the ID only twice.
+ *
+ * @param {object} [opts]
+ * @param {number} [opts.bits] — size of each generation's bit array (power of two)
+ * @param {number} [opts.hashes] — number of hash functions
+ * @param {number} [opts.capacity] — inserts per generation before rotating
+ */
+export function createBloomFilter({
+  bits = DEFAULT_BLOOM_BITS,
+  hashes = DEFAULT_BLOOM_HASHES,
+  capacity = DEFAULT_BLOOM_CAPACITY,
+} = {}) {
+  if (!Number.isInteger(bits) || bits < 8 || (bits & (bits - 1)) !== 0) {
+    throw new Error(`Bloom filter size must be a power of two ≥ 8, got ${bits}`);
+  }
+
+  const mask = bits - 1;
+  const bytes = bits / 8;
+  let active = new Uint8Array(bytes);
+  let passive = new Uint8Array(bytes);
+  let inserts = 0;
+
+  function test(array, h1, h2) {
+    for (let i = 0; i < hashes; i++) {
+      const bit = (h1 + Math.imul(i, h2)) & mask;
+      if ((array[bit >>> 3] & (1 << (bit & 7))) === 0) return false;
+    }
+    return true;
+  }
+
+  function add(value) {
+    const h1 = fnv1a(value, 0);
+    const h2 = fnv1a(value, SECOND_HASH_SEED) | 1; // odd stride visits distinct bits
+    for (let i = 0; i < hashes; i++) {
+      const bit = (h1 + Math.imul(i, h2)) & mask;
+      active[bit >>> 3] |= 1 << (bit & 7);
+    }
+
+    if (++inserts >= capacity) {
+      passive = active;
+      active = new Uint8Array(bytes);
+      inserts = 0;
+    }
+  }
+
+  function has(value) {
+    const h1 = fnv1a(value, 0);
+    const h2 = fnv1a(value, SECOND_HASH_SEED) | 1;
+    return test(active, h1, h2) || test(passive, h1, h2);
+  }
+
+  function clear() {
+    active.fill(0);
+    passive.fill(0);
+    inserts = 0;
+  }
+
+  function exportState() {
+    return {
+      active: Buffer.from(active).toString('base64'),
+      passive: Buffer.from(passive).toString('base64'),
+      inserts,
+    };
+  }
+
+  /**
+   * Restore state produced by exportState(). Returns false (and leaves the
+   * filter untouched) if the state was written with a different size.
+   */
+  function importState(state) {
+    const nextActive = Buffer.from(state?.active ?? '', 'base64');
+    const nextPassive = Buffer.from(state?.passive ?? '', 'base64');
+    if (nextActive.length !== bytes || nextPassive.length !== bytes) return false;
+
+    active = new Uint8Array(nextActive);
+    passive = new Uint8Array(nextPassive);
+    inserts = Number(state.inserts) || 0;
+    return true;
+  }
+
+  return { add, has, clear, exportState, importState };
+}
+
+/**
+ * Create a message ID de-duplicator (exact LRU first, Bloom filter behind).
+ *
+ * @param {object} [opts]
+ * @param {number} [opts.bloomBits]
+ * @param {number} [opts.bloomHashes]
+ * @param {number} [opts.bloomCapacity]
+ * @param {number} [opts.exactLimit] — number of recent IDs answered without false positives
+ * @param {string} [opts.statePath] — JSON file used by load()/save(); persistence is off without it
+ * @param {number} [opts.checkpointEvery] — save in the background after this many new IDs
+ * @param {function} [opts.onError] — called with background checkpoint errors
+ */
+export function createMessageDeduper({
+  bloomBits = DEFAULT_BLOOM_BITS,
+  bloomHashes = DEFAULT_BLOOM_HASHES,
+  bloomCapacity = DEFAULT_BLOOM_CAPACITY,
+  exactLimit = DEFAULT_EXACT_LIMIT,
+  statePath = null,
+  checkpointEvery = DEFAULT_CHECKPOINT_EVERY,
+  onError = null,
+} = {}) {
+  const bloom = createBloomFilter({ bits: bloomBits, hashes: bloomHashes, capacity: bloomCapacity });
+  const exact = new Map(); // insertion-ordered → LRU eviction from the front
+  // IDs released by forget() — their Bloom bits cannot be cleared, so this overrides them
+  const forgotten = new Set();
+  let insertsSinceSave = 0;
+  let lastSave = Promise.resolve();
+
+  function remember(id) {
+    exact.delete(id);
+    exact.set(id, true);
+    if (exact.size > exactLimit) {
+      exact.delete(exact.keys().next().value);
+    }
+  }
+
+  /**
+   * Record a message ID. Returns true if it was already seen.
+   * @param {string} id
+   * @returns {boolean}
+   */
+  function isDuplicate(id) {
+    if (exact.has(id)) {
+      remember(id);
+      return true;
+    }
+
+    if (forgotten.has(id)) {
+      forgotten.delete(id);
+    } else if (bloom.has(id)) {
+      // Aged out of the exact LRU (or, rarely, a false positive)
+      remember(id);
+      return true;
+    }
+
+    bloom.add(id);
+    remember(id);
+
+    if (statePath && ++insertsSinceSave >= checkpointEvery) {
+      save().catch((err) => onError?.(err));
+    }
+    return false;
+  }
+
+  /**
+   * Forget a message ID so a redelivery is processed again
+   * (e.g. after handling it failed).
+   * @param {string} id
+   * @returns {boolean} true if the ID was being tracked
+   */
+  function forget(id) {
+    const tracked = exact.delete(id) || bloom.has(id);
+    if (tracked) {
+      forgotten.add(id);
+      if (forgotten.size > exactLimit) {
+        forgotten.delete(forgotten.values().next().value);
+      }
+    }
+    return tracked;
+  }
+
+  /**
+   * Load persisted state. A missing file is not an error.
+   * @returns {Promise<boolean>} true if state was restored
+   */
+  async function load() {
+    if (!statePath) return false;
+
+    let state;
+    try {
+      state = JSON.parse(await readFile(statePath, 'utf-8'));
+    } catch (err) {
+      if (err.code === 'ENOENT') return false;
+      throw err;
+    }
+
+    if (state?.version !== STATE_VERSION || !bloom.importState(state.bloom)) return false;
+
+    exact.clear();
+    for (const id of (state.recent ?? []).slice(-exactLimit)) {
+      exact.set(id, true);
+    }
+    forgotten.clear();
+    for (const id of (state.forgotten ?? []).slice(-exactLimit)) {
+      forgotten.add(id);
+    }
+    return true;
+  }
+
+  async function writeState() {
+    const payload = JSON.stringify({
+      version: STATE_VERSION,
+      bloom: bloom.exportState(),
+      recent: [...exact.keys()],
+      forgotten: [...forgotten],
+    });
+    const tmpPath = `${statePath}.tmp`;
+    await writeFile(tmpPath, payload, { mode: 0o600 });
+    await rename(tmpPath, statePath);
+  }
+
+  /**
+   * Write state atomically (temp file + rename) so a crash mid-write never
+   * leaves a truncated file behind. Saves are serialized.
+   * @returns {Promise<void>}
+   */
+  function save() {
+    if (!statePath) return Promise.resolve();
+
+    insertsSinceSave = 0;
+    const run = lastSave.then(writeState);
+    lastSave = run.catch(() => {}); // a failed save must not block the next one
+    return run;
+  }
+
+  return { isDuplicate, forget, load, save };
+}
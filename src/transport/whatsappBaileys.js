@@ -1,11 +1,87 @@
 import { mkdir, rm } from 'node:fs/promises';
+import { join } from 'node:path';
 import { TransportAdapter, TRANSPORT_STATES } from './base.js';
-import QRCode from 'qrcode';
+import { createMessageDeduper } from './messageDedup.js';
 
 // Baileys import — dynamic to allow the system to boot even if baileys has issues
-let makeWASocket, useMultiFileAuthState, DisconnectReason, fetchLatestBaileysVersion, makeCacheableSignalKeyStore;
+let makeWASocket, useMultiFileAuthState, DisconnectReason, fetchLatestBaileysVersion, makeCacheableSignalKeyStore,
+  downloadMediaMessage;
+
+// qrcode is only needed while waiting for a scan — loaded on the first QR
+let QRCode = null;
+
+const RECONNECT_BASE_DELAY_MS = 2000;
+const RECONNECT_MAX_DELAY_MS = 60000;
+const QR_RENDER_OPTIONS = Object.freeze({ type: 'svg', margin: 4, width: 300 }); // width matches .qr-image max-width
+const USER_JID_SUFFIX = '@s.whatsapp.net';
+const GROUP_JID_SUFFIX = '@g.us';
+const DEDUP_STATE_FILE = 'dedup-state.json'; // lives next to the session so it shares its lifetime
+const PROFILE_PHOTO_CACHE_LIMIT = 4096;
+const PROFILE_PHOTO_TTL_MS = 60 * 60 * 1000; // photo URLs change rarely and expire after days
+// IQ error codes/texts that mean "no photo to show" rather than a failed request
+const PROFILE_PHOTO_MISS_CODES = new Set([401, 404]);
+const PROFILE_PHOTO_MISS_TEXTS = new Set(['not-authorized', 'item-not-found']);
+
+// Baileys media payload key → normalized media handling
+const MEDIA_MESSAGE_TYPES = Object.freeze({
+  imageMessage: { mediaType: 'image', defaultMime: 'image/jpeg', placeholder: '[Image]', captionField: 'caption' },
+  audioMessage: { mediaType: 'audio', defaultMime: 'audio/ogg', placeholder: '[Audio message]', captionField: null },
+  videoMessage: { mediaType: 'video', defaultMime: 'video/mp4', placeholder: '[Video]', captionField: 'caption' },
+  documentMessage: {
+    mediaType: 'document',
+    defaultMime: 'application/octet-stream',
+    placeholder: '[Document]',
+    captionField: 'fileName',
+    keepOriginalName: true,
+  },
+});
+const MEDIA_MESSAGE_KEYS = Object.keys(MEDIA_MESSAGE_TYPES);
 
-const BACKOFF_DELAYS = [2000, 5000, 10000, 30000, 60000]; // ms
+/**
+ * Find the first supported media payload in a Baileys message.
+ * @param {object} msgContent — msg.message
+ * @returns {{ spec: object, payload: object }|null}
+ */
+function findMediaMessage(msgContent) {
+  for (const key of MEDIA_MESSAGE_KEYS) {
+    const payload = msgContent[key];
+    if (payload) return { spec: MEDIA_MESSAGE_TYPES[key], payload };
+  }
+  return null;
+}
+
+/**
+ * Whether a profilePictureUrl() failure is a definite answer (no photo, or
+ * hidden by the contact's privacy settings) as opposed to a transient error.
+ * Baileys raises IQ errors as Boom errors with the IQ code in `data`.
+ * @param {Error} err
+ * @returns {boolean}
+ */
+function isProfilePhotoMiss(err) {
+  return PROFILE_PHOTO_MISS_CODES.has(err?.data)
+    || PROFILE_PHOTO_MISS_CODES.has(err?.output?.statusCode)
+    || PROFILE_PHOTO_MISS_TEXTS.has(err?.message);
+}
+
+/**
+ * Build a Baileys JID from a remote_id (phone number). Values that already
+ * carry a domain (@s.whatsapp.net, @lid, …) are passed through unchanged.
+ * @param {string} remoteId
+ * @returns {string}
+ */
+function toUserJid(remoteId) {
+  return remoteId.includes('@') ? remoteId : `${remoteId}${USER_JID_SUFFIX}`;
+}
+
+/**
+ * Strip the user JID suffix to get the phone number used as remote_id.
+ * Other JID forms (e.g. @lid) are passed through unchanged.
+ * @param {string} jid
+ * @returns {string}
+ */
+function jidToRemoteId(jid) {
+  return jid.endsWith(USER_JID_SUFFIX) ? jid.slice(0, -USER_JID_SUFFIX.length) : jid;
+}
 
 /**
  * WhatsApp Baileys (Web) transport adapter.
@@ -16,10 +92,10 @@ const BACKOFF_DELAYS = [2000, 5000, 10000, 30000, 60000]; // ms
  * Presence support:
  * - sendPresenceUpdate('available') — go online
  * - sendPresenceUpdate('unavailable') — go offline
- * - sendPresenceUpdate('composing', jid) — show typing
- * - sendPresenceUpdate('paused', jid) — stop typing
+ * - sendPresenceUpdate('composing', remoteId) — show typing
+ * - sendPresenceUpdate('paused', remoteId) — stop typing
  * - markRead(keys) — mark messages as read (blue ticks)
- * - fetchProfilePhoto(jid) — get profile picture URL
+ * - fetchProfilePhoto(remoteId) — get profile picture URL
  *
  * HONEST LIMITATIONS:
  * - "last seen" is NOT controllable. WhatsApp controls this server-side.
@@ -36,6 +112,14 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
     this._reconnectAttempt = 0;
     this._reconnectTimer = null;
     this._intentionalDisconnect = false;
+    this._baileysLogger = null;
+    this._waVersion = null;
+    this._deduper = createMessageDeduper({
+      statePath: join(this._config.authDir, DEDUP_STATE_FILE),
+      onError: (err) => this._log('warn', `Dedup checkpoint failed: ${err.message}`),
+    });
+    this._profilePhotoCache = new Map(); // jid → { url, fetchedAt }, least recently used first
+    this._qr = null; // { raw, dataUrl } of the pending login QR, null once connected
   }
 
   setLogger(logger) {
@@ -58,6 +142,14 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
       return;
     }
 
+    try {
+      if (await this._deduper.load()) {
+        this._log('info', 'Restored inbound message dedup state');
+      }
+    } catch (err) {
+      this._log('warn', `Could not restore dedup state: ${err.message}`);
+    }
+
     await this._connect();
   }
 
@@ -73,6 +165,7 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
     DisconnectReason = baileys.DisconnectReason ?? mod.DisconnectReason;
     fetchLatestBaileysVersion = baileys.fetchLatestBaileysVersion ?? mod.fetchLatestBaileysVersion;
     makeCacheableSignalKeyStore = baileys.makeCacheableSignalKeyStore ?? mod.makeCacheableSignalKeyStore;
+    downloadMediaMessage = baileys.downloadMediaMessage ?? mod.downloadMediaMessage;
   }
 
   /**
@@ -83,19 +176,12 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
     this._setStatus(TRANSPORT_STATES.CONNECTING, 'Loading auth state…');
 
     try {
-      const { state, saveCreds } = await useMultiFileAuthState(this._config.authDir);
-
-      // Create a silent pino logger for Baileys internal logging
-      const { default: pino } = await import('pino');
-      const baileysLogger = pino({ level: 'silent' });
-
-      let version;
-      try {
-        const versionInfo = await fetchLatestBaileysVersion();
-        version = versionInfo.version;
-      } catch {
-        this._log('warn', 'Could not fetch latest Baileys version, using default');
-      }
+      // Independent startup work runs concurrently: disk (auth state) and network (version)
+      const [{ state, saveCreds }, baileysLogger, version] = await Promise.all([
+        useMultiFileAuthState(this._config.authDir),
+        this._getBaileysLogger(),
+        this._resolveVersion(),
+      ]);
 
       const socketOpts = {
         auth: {
@@ -113,6 +199,8 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
         socketOpts.version = version;
       }
 
+      // Never leave a previous socket alive (or listening) behind the new one
+      await this._closeSocket({ logout: false });
       this._socket = makeWASocket(socketOpts);
 
       // ── Credential updates ───────────────────────────────────────────────
@@ -135,6 +223,33 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
     }
   }
 
+  /**
+   * Silent pino logger for Baileys internal logging — created once per transport.
+   */
+  async _getBaileysLogger() {
+    if (!this._baileysLogger) {
+      const { default: pino } = await import('pino');
+      this._baileysLogger = pino({ level: 'silent' });
+    }
+    return this._baileysLogger;
+  }
+
+  /**
+   * Latest WhatsApp Web version, fetched once and reused across reconnects.
+   * Returns undefined (Baileys' built-in default) if the lookup fails.
+   */
+  async _resolveVersion() {
+    if (this._waVersion) return this._waVersion;
+
+    try {
+      const versionInfo = await fetchLatestBaileysVersion();
+      this._waVersion = versionInfo.version;
+    } catch (err) {
+      this._log('warn', `Could not fetch latest Baileys version, using default: ${err.message}`);
+    }
+    return this._waVersion;
+  }
+
   /**
    * Handle Baileys connection.update events: QR, open, close.
    */
@@ -144,22 +259,30 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
     // QR code available — emit for GUI and log for terminal
     if (qr) {
       this._setStatus(TRANSPORT_STATES.WAITING_FOR_QR, 'Scan QR code with WhatsApp');
-      try {
-        const qrDataUrl = await QRCode.toDataURL(qr);
-        this.emit('qr', { qrDataUrl });
-        this._log('info', 'QR code generated — scan with WhatsApp mobile app');
-      } catch (err) {
-        this._log('error', `QR code generation failed: ${err.message}`);
+      // WhatsApp rotates the QR roughly every 20s — only re-encode when it actually changed
+      if (qr !== this._qr?.raw) {
+        try {
+          QRCode ??= (await import('qrcode')).default;
+          // SVG is plain string building — no PNG rasterizing/deflate on every rotation
+          const svg = await QRCode.toString(qr, QR_RENDER_OPTIONS);
+          this._qr = { raw: qr, dataUrl: `data:image/svg+xml;base64,${Buffer.from(svg).toString('base64')}` };
+          this.emit('qr', { qrDataUrl: this._qr.dataUrl });
+          this._log('info', 'QR code generated — scan with WhatsApp mobile app');
+        } catch (err) {
+          this._log('error', `QR code generation failed: ${err.message}`);
+        }
       }
     }
 
     if (connection === 'open') {
+      this._qr = null;
       this._reconnectAttempt = 0;
       this._setStatus(TRANSPORT_STATES.CONNECTED, 'WhatsApp Web connected');
       this._log('info', 'Connected to WhatsApp Web');
     }
 
     if (connection === 'close') {
+      this._qr = null; // a QR from a closed socket can no longer be scanned
       const statusCode = lastDisconnect?.error?.output?.statusCode;
       const reason = lastDisconnect?.error?.message ?? 'Unknown';
 
@@ -197,70 +320,49 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
       // Skip messages from self
       if (msg.key.fromMe) continue;
 
-      // Skip status broadcasts
-      if (msg.key.remoteJid === 'status@broadcast') continue;
-
       const from = msg.key.remoteJid;
-      const pushName = msg.pushName ?? from;
 
-      let content = '';
-      let mediaInfo = null;
-      let downloadMedia = null;
+      // Skip status broadcasts
+      if (from === 'status@broadcast') continue;
 
+      // Skip group chats before touching the payload — replies are 1:1 only
+      if (from.endsWith(GROUP_JID_SUFFIX)) continue;
+
+      // Stub/protocol entries carry no content — drop them before they reach the dedup set
       const msgContent = msg.message;
       if (!msgContent) continue;
 
-      if (msgContent.conversation) {
-        content = msgContent.conversation;
-      } else if (msgContent.extendedTextMessage?.text) {
-        content = msgContent.extendedTextMessage.text;
-      } else if (msgContent.imageMessage) {
-        content = msgContent.imageMessage.caption ?? '[Image]';
-        mediaInfo = {
-          media_type: 'image',
-          media_url: msg.key.id ?? '',
-          media_mime_type: msgContent.imageMessage.mimetype ?? 'image/jpeg',
-          media_size_bytes: msgContent.imageMessage.fileLength
-            ? Number(msgContent.imageMessage.fileLength) : null,
-        };
-        downloadMedia = this._createMediaDownloader(msg);
-      } else if (msgContent.audioMessage) {
-        content = '[Audio message]';
-        mediaInfo = {
-          media_type: 'audio',
-          media_url: msg.key.id ?? '',
-          media_mime_type: msgContent.audioMessage.mimetype ?? 'audio/ogg',
-          media_size_bytes: msgContent.audioMessage.fileLength
-            ? Number(msgContent.audioMessage.fileLength) : null,
-        };
-        downloadMedia = this._createMediaDownloader(msg);
-      } else if (msgContent.videoMessage) {
-        content = msgContent.videoMessage.caption ?? '[Video]';
-        mediaInfo = {
-          media_type: 'video',
-          media_url: msg.key.id ?? '',
-          media_mime_type: msgContent.videoMessage.mimetype ?? 'video/mp4',
-          media_size_bytes: msgContent.videoMessage.fileLength
-            ? Number(msgContent.videoMessage.fileLength) : null,
-        };
-        downloadMedia = this._createMediaDownloader(msg);
-      } else if (msgContent.documentMessage) {
-        content = msgContent.documentMessage.fileName ?? '[Document]';
-        mediaInfo = {
-          media_type: 'document',
-          media_url: msg.key.id ?? '',
-          media_mime_type: msgContent.documentMessage.mimetype ?? 'application/octet-stream',
-          media_size_bytes: msgContent.documentMessage.fileLength
-            ? Number(msgContent.documentMessage.fileLength) : null,
-          original_name: msgContent.documentMessage.fileName ?? null,
-        };
-        downloadMedia = this._createMediaDownloader(msg);
-      } else {
-        content = '[Unsupported message type]';
+      // Skip redeliveries (Baileys may replay recent messages after a reconnect)
+      if (msg.key.id && this._deduper.isDuplicate(msg.key.id)) continue;
+
+      // Plain text is the common case — only fall through to the media table without it
+      let content = msgContent.conversation || msgContent.extendedTextMessage?.text || '';
+      let mediaInfo = null;
+      let downloadMedia = null;
+
+      if (!content) {
+        const media = findMediaMessage(msgContent);
+        if (media) {
+          const { spec, payload } = media;
+          content = (spec.captionField && payload[spec.captionField]) || spec.placeholder;
+          mediaInfo = {
+            media_type: spec.mediaType,
+            media_url: msg.key.id ?? '',
+            media_mime_type: payload.mimetype ?? spec.defaultMime,
+            media_size_bytes: payload.fileLength ? Number(payload.fileLength) : null,
+          };
+          if (spec.keepOriginalName) {
+            mediaInfo.original_name = payload.fileName ?? null;
+          }
+          downloadMedia = this._createMediaDownloader(msg);
+        } else {
+          content = '[Unsupported message type]';
+        }
       }
 
       // Normalize Baileys JID to phone number (strip @s.whatsapp.net)
-      const phoneNumber = from.replace(/@s\.whatsapp\.net$/, '').replace(/@g\.us$/, '');
+      const phoneNumber = jidToRemoteId(from);
+      const pushName = msg.pushName ?? from;
 
       this._log('info', `Inbound message from ${phoneNumber}`, { pushName, mediaType: mediaInfo?.media_type });
 
@@ -275,6 +377,15 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
     }
   }
 
+  /**
+   * Drop a message ID from the dedup set so WhatsApp's redelivery is handled.
+   */
+  forgetInbound(messageKey) {
+    if (messageKey?.id) {
+      this._deduper.forget(messageKey.id);
+    }
+  }
+
   /**
    * Create a media download function for a Baileys message.
    * Returns an async function that produces a Buffer.
@@ -283,9 +394,6 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
   _createMediaDownloader(msg) {
     return async () => {
       if (!this._socket) throw new Error('Baileys socket not available');
-      // Dynamic import to resolve downloadMediaMessage at call time
-      const baileys = await import('@whiskeysockets/baileys');
-      const downloadMediaMessage = baileys.downloadMediaMessage ?? baileys.default?.downloadMediaMessage;
       if (!downloadMediaMessage) {
         throw new Error('downloadMediaMessage not available in Baileys');
       }
@@ -309,8 +417,9 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
     if (logout) {
       try {
         await this._socket.logout();
-      } catch {
+      } catch (err) {
         // logout may fail if already disconnected — auth files are still removed for regeneration
+        this._log('debug', `Logout during socket close failed: ${err.message}`);
       }
     }
 
@@ -318,25 +427,38 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
       this._socket.ev?.removeAllListeners?.('connection.update');
       this._socket.ev?.removeAllListeners?.('creds.update');
       this._socket.ev?.removeAllListeners?.('messages.upsert');
-    } catch {
+    } catch (err) {
       // listener cleanup is best-effort during QR regeneration/shutdown
+      this._log('debug', `Socket listener cleanup failed: ${err.message}`);
     }
 
     try {
       this._socket.end(undefined);
-    } catch {
-      // end may also fail — ignore
+    } catch (err) {
+      // end may also fail on an already-closed socket
+      this._log('debug', `Socket end failed: ${err.message}`);
     }
 
     this._socket = null;
   }
 
+  /**
+   * Data URL of the QR currently waiting to be scanned, or null.
+   * Lets late-joining GUI clients show it without waiting for the next rotation.
+   * @returns {string|null}
+   */
+  getQrDataUrl() {
+    return this._qr?.dataUrl ?? null;
+  }
+
   /**
    * Invalidate the current QR/session attempt and force Baileys to emit a fresh QR.
    */
   async regenerateLogin() {
     this._intentionalDisconnect = true;
     this._reconnectAttempt = 0;
+    this._waVersion = null; // a fresh login also re-checks the WhatsApp Web version
+    this._qr = null;
 
     if (this._reconnectTimer) {
       clearTimeout(this._reconnectTimer);
@@ -360,17 +482,24 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
 
   /**
    * Schedule a reconnection attempt with exponential backoff.
+   * Single-flight: while an attempt is pending, further close/error events
+   * do not queue another one, so flapping never multiplies sockets.
    */
   _scheduleReconnect() {
-    if (this._intentionalDisconnect) return;
+    if (this._intentionalDisconnect || this._reconnectTimer) return;
 
-    const delay = BACKOFF_DELAYS[Math.min(this._reconnectAttempt, BACKOFF_DELAYS.length - 1)];
+    // Exponential backoff capped at a minute, with equal jitter so a flapping
+    // network does not retry in lockstep (and is not hammered at a fixed rate)
+    const ceiling = Math.min(RECONNECT_MAX_DELAY_MS, RECONNECT_BASE_DELAY_MS * 2 ** this._reconnectAttempt);
+    const delay = Math.round(ceiling / 2 + Math.random() * (ceiling / 2));
     this._reconnectAttempt++;
 
-    this._setStatus(TRANSPORT_STATES.RECONNECTING, `Reconnecting in ${delay / 1000}s (attempt ${this._reconnectAttempt})`);
-    this._log('info', `Reconnecting in ${delay / 1000}s (attempt ${this._reconnectAttempt})`);
+    const seconds = (delay / 1000).toFixed(1);
+    this._setStatus(TRANSPORT_STATES.RECONNECTING, `Reconnecting in ${seconds}s (attempt ${this._reconnectAttempt})`);
+    this._log('info', `Reconnecting in ${seconds}s (attempt ${this._reconnectAttempt})`);
 
     this._reconnectTimer = setTimeout(() => {
+      this._reconnectTimer = null;
       this._connect();
     }, delay);
   }
@@ -383,8 +512,7 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
       return { success: false, error: 'Transport not connected' };
     }
 
-    // Normalize recipient to Baileys JID format
-    const jid = to.includes('@') ? to : `${to}@s.whatsapp.net`;
+    const jid = toUserJid(to);
 
     try {
       const result = await this._socket.sendMessage(jid, { text: content });
@@ -400,15 +528,15 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
   /**
    * Send presence update via Baileys.
    * @param {string} type — 'available' | 'unavailable' | 'composing' | 'paused'
-   * @param {string} [jid] — required for composing/paused
+   * @param {string} [remoteId] — phone number or JID; required for composing/paused
    */
-  async sendPresenceUpdate(type, jid) {
+  async sendPresenceUpdate(type, remoteId) {
     if (!this._socket || this._status !== TRANSPORT_STATES.CONNECTED) return;
 
     try {
       if (type === 'composing' || type === 'paused') {
-        if (jid) {
-          await this._socket.sendPresenceUpdate(type, jid);
+        if (remoteId) {
+          await this._socket.sendPresenceUpdate(type, toUserJid(remoteId));
         }
       } else {
         // 'available' or 'unavailable' — global presence
@@ -442,19 +570,42 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
   async fetchProfilePhoto(remoteId) {
     if (!this._socket || this._status !== TRANSPORT_STATES.CONNECTED) return null;
 
-    const jid = remoteId.includes('@') ? remoteId : `${remoteId}@s.whatsapp.net`;
+    const jid = toUserJid(remoteId);
+
+    const cached = this._profilePhotoCache.get(jid);
+    if (cached && Date.now() - cached.fetchedAt < PROFILE_PHOTO_TTL_MS) {
+      this._profilePhotoCache.delete(jid);
+      this._profilePhotoCache.set(jid, cached);
+      return cached.url;
+    }
 
+    let url = null;
     try {
-      const url = await this._socket.profilePictureUrl(jid, 'image');
-      return url ?? null;
-    } catch {
+      url = (await this._socket.profilePictureUrl(jid, 'image')) ?? null;
+    } catch (err) {
+      if (!isProfilePhotoMiss(err)) {
+        // Timeout or connection trouble — retry on the next request instead of caching
+        this._log('warn', `Profile photo lookup failed for ${remoteId}: ${err.message}`);
+        return null;
+      }
       // Profile picture not available or privacy setting blocks it
-      return null;
+      this._log('debug', `No profile photo for ${remoteId}: ${err.message}`);
+    }
+
+    // Confirmed misses are cached too — a hidden photo stays hidden for the TTL
+    this._profilePhotoCache.delete(jid);
+    this._profilePhotoCache.set(jid, { url, fetchedAt: Date.now() });
+    if (this._profilePhotoCache.size > PROFILE_PHOTO_CACHE_LIMIT) {
+      this._profilePhotoCache.delete(this._profilePhotoCache.keys().next().value);
     }
+
+    return url;
   }
 
   /**
    * Graceful shutdown: close the Baileys socket, cancel reconnect timer.
+   * The linked device is NOT logged out, so the saved session is reused on
+   * the next start without a new QR scan.
    */
   async shutdown() {
     this._intentionalDisconnect = true;
@@ -464,7 +615,13 @@ export class WhatsAppBaileysTransport extends TransportAdapter {
       this._reconnectTimer = null;
     }
 
-    await this._closeSocket({ logout: true });
+    await this._closeSocket({ logout: false });
+
+    try {
+      await this._deduper.save();
+    } catch (err) {
+      this._log('warn', `Could not persist dedup state: ${err.message}`);
+    }
 
     this._setStatus(TRANSPORT_STATES.DISCONNECTED, 'Shut down');
     this._log('info', 'Baileys transport shut down');
@@ -2,6 +2,19 @@ import { TransportAdapter, TRANSPORT_STATES } from './base.js';
 
 const GRAPH_API_BASE = 'https://graph.facebook.com/v21.0';
 
+// Cloud API message type → how to turn its payload into content + mediaInfo
+const MEDIA_MESSAGE_TYPES = Object.freeze({
+  image: { defaultMime: 'image/jpeg', placeholder: '[Image]', captionField: 'caption' },
+  audio: { defaultMime: 'audio/ogg', placeholder: '[Audio message]', captionField: null },
+  video: { defaultMime: 'video/mp4', placeholder: '[Video]', captionField: 'caption' },
+  document: {
+    defaultMime: 'application/octet-stream',
+    placeholder: '[Document]',
+    captionField: 'filename',
+    keepOriginalName: true,
+  },
+});
+
 /**
  * WhatsApp Cloud API transport adapter.
  *
@@ -124,52 +137,37 @@ export class WhatsAppCloudTransport extends TransportAdapter {
       for (const change of changes) {
         const value = change.value ?? {};
         const messages = value.messages ?? [];
-        const contacts = value.contacts ?? [];
+        if (messages.length === 0) continue; // status callbacks carry no messages
+
+        // wa_id → display name, built once per change instead of a scan per message
+        const displayNames = new Map();
+        for (const contact of value.contacts ?? []) {
+          if (contact.profile?.name) displayNames.set(contact.wa_id, contact.profile.name);
+        }
 
         for (const msg of messages) {
           const from = msg.from;
-          const contact = contacts.find(c => c.wa_id === from);
-          const displayName = contact?.profile?.name ?? from;
+          const displayName = displayNames.get(from) ?? from;
 
           let content = '';
           let mediaInfo = null;
           let downloadMedia = null;
 
+          const spec = MEDIA_MESSAGE_TYPES[msg.type];
           if (msg.type === 'text') {
             content = msg.text?.body ?? '';
-          } else if (msg.type === 'image') {
-            content = msg.image?.caption ?? '[Image]';
-            mediaInfo = {
-              media_type: 'image',
-              media_url: msg.image?.id ?? '',
-              media_mime_type: msg.image?.mime_type ?? 'image/jpeg',
-            };
-            downloadMedia = this._createCloudMediaDownloader(msg.image?.id);
-          } else if (msg.type === 'audio') {
-            content = '[Audio message]';
-            mediaInfo = {
-              media_type: 'audio',
-              media_url: msg.audio?.id ?? '',
-              media_mime_type: msg.audio?.mime_type ?? 'audio/ogg',
-            };
-            downloadMedia = this._createCloudMediaDownloader(msg.audio?.id);
-          } else if (msg.type === 'video') {
-            content = msg.video?.caption ?? '[Video]';
-            mediaInfo = {
-              media_type: 'video',
-              media_url: msg.video?.id ?? '',
-              media_mime_type: msg.video?.mime_type ?? 'video/mp4',
-            };
-            downloadMedia = this._createCloudMediaDownloader(msg.video?.id);
-          } else if (msg.type === 'document') {
-            content = msg.document?.filename ?? '[Document]';
+          } else if (spec) {
+            const payload = msg[msg.type] ?? {};
+            content = (spec.captionField && payload[spec.captionField]) ?? spec.placeholder;
             mediaInfo = {
-              media_type: 'document',
-              media_url: msg.document?.id ?? '',
-              media_mime_type: msg.document?.mime_type ?? 'application/octet-stream',
-              original_name: msg.document?.filename ?? null,
+              media_type: msg.type,
+              media_url: payload.id ?? '',
+              media_mime_type: payload.mime_type ?? spec.defaultMime,
             };
-            downloadMedia = this._createCloudMediaDownloader(msg.document?.id);
+            if (spec.keepOriginalName) {
+              mediaInfo.original_name = payload.filename ?? null;
+            }
+            downloadMedia = this._createCloudMediaDownloader(payload.id);
           } else {
             content = `[Unsupported message type: ${msg.type}]`;
           }
@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
-import { createAIProvider, normalizeLmStudioMessageContent, normalizeLmStudioApiChatResponse, normalizeEphemeralMcpIntegrations, serializeMessagesForLmStudioInput } from '../src/ai/provider.js';
+import { createAIProvider } from '../src/ai/provider.js';
 
 // Mock the OpenAI module
 vi.mock('openai', () => {
@@ -58,14 +58,13 @@ describe('AI Provider — generateReply', () => {
     // Reset mocks
     vi.clearAllMocks();
 
-    // Import the mocked OpenAI to access the mock
+    // Import the mocked OpenAI to hand the client its create mock
+    // (the SDK client is only instantiated on first use)
     const OpenAI = (await import('openai')).default;
+    mockCreate = vi.fn();
+    OpenAI.mockImplementation(() => ({ chat: { completions: { create: mockCreate } } }));
 
     provider = createAIProvider(makeConfig());
-
-    // Get the mock create function from the instantiated client
-    const instance = OpenAI.mock.results[0].value;
-    mockCreate = instance.chat.completions.create;
   });
 
   it('returns content and token usage on success', async () => {
@@ -102,6 +101,19 @@ describe('AI Provider — generateReply', () => {
     expect(result.tokenUsage).toEqual({ prompt: 0, completion: 0, total: 0 });
   });
 
+  it('reports a client that cannot be created as a classified failure', async () => {
+    const OpenAI = (await import('openai')).default;
+    OpenAI.mockImplementationOnce(() => {
+      throw new Error("Cannot find package 'openai'");
+    });
+
+    await expect(
+      provider.generateReply([{ role: 'user', content: 'test' }])
+    ).rejects.toMatchObject({ type: 'provider_error' });
+    expect(provider.getStatus().connected).toBe(false);
+    expect(provider.getStatus().lastError).toBe("Cannot find package 'openai'");
+  });
+
   it('throws classified auth error on 401', async () => {
     mockCreate.mockRejectedValueOnce(Object.assign(new Error('Unauthorized'), { status: 401 }));
 
@@ -181,9 +193,9 @@ describe('AI Provider — testConnection', () => {
   beforeEach(async () => {
     vi.clearAllMocks();
     const OpenAI = (await import('openai')).default;
+    mockCreate = vi.fn();
+    OpenAI.mockImplementation(() => ({ chat: { completions: { create: mockCreate } } }));
     provider = createAIProvider(makeConfig());
-    const instance = OpenAI.mock.results[0].value;
-    mockCreate = instance.chat.completions.create;
   });
 
   it('returns success on valid response', async () => {
@@ -302,8 +314,8 @@ describe('AI Provider — Local AI / LM Studio', () => {
         permissionToken: 'must-not-leak',
       },
     }));
-    const instance = OpenAI.mock.results[0].value;
-    instance.chat.completions.create.mockResolvedValueOnce({ choices: [{ message: { content: 'cloud ok' } }] });
+    const create = vi.fn().mockResolvedValueOnce({ choices: [{ message: { content: 'cloud ok' } }] });
+    OpenAI.mockImplementationOnce(() => ({ chat: { completions: { create } } }));
 
     await provider.generateReply([{ role: 'user', content: 'Hi' }]);
 
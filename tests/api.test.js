@@ -1,5 +1,4 @@
 import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
-import { rmSync } from 'node:fs';
 import Fastify from 'fastify';
 import formbody from '@fastify/formbody';
 import { initDatabase, closeDatabase } from '../src/persistence/database.js';
@@ -9,13 +8,8 @@ import healthRoutes from '../src/api/health.js';
 import conversationRoutes from '../src/api/conversations.js';
 import settingsRoutes from '../src/api/settings.js';
 
-const TEST_DB_PATH = './data/test-api.db';
-
-function cleanupTestDb() {
-  try { rmSync(TEST_DB_PATH, { force: true }); } catch {}
-  try { rmSync(TEST_DB_PATH + '-wal', { force: true }); } catch {}
-  try { rmSync(TEST_DB_PATH + '-shm', { force: true }); } catch {}
-}
+// Private in-memory database per initDatabase() — no files to create or clean up
+const TEST_DB_PATH = ':memory:';
 
 const TEST_CONFIG = {
   version: '2.0.0',
@@ -58,7 +52,6 @@ let mockOrchestrator;
 let mockIO;
 
 async function buildApp() {
-  cleanupTestDb();
   initDatabase(TEST_CONFIG);
 
   fastify = Fastify({ logger: false, bodyLimit: 8 * 1024 * 1024 });
@@ -78,7 +71,6 @@ async function buildApp() {
 async function teardownApp() {
   await fastify.close();
   closeDatabase();
-  cleanupTestDb();
 }
 
 // ── Health endpoint ────────────────────────────────────────────────────────
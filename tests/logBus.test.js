@@ -21,4 +21,16 @@ describe('logBus', () => {
     expect(entry.message).toBe('Backend started');
     expect(entry.meta.apiKey).toBe('[redacted]');
   });
+
+  it('keeps only the newest entries, oldest first', () => {
+    for (let i = 0; i < 305; i++) {
+      appendLogEntry({ level: 'info', message: `line ${i}` });
+    }
+
+    const all = getRecentLogEntries(300);
+    expect(all).toHaveLength(300);
+    expect(all[0].message).toBe('line 5');
+    expect(all.at(-1).message).toBe('line 304');
+    expect(getRecentLogEntries(2).map((entry) => entry.message)).toEqual(['line 303', 'line 304']);
+  });
 });
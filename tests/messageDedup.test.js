@@ -0,0 +1,150 @@
+import { describe, it, expect, afterEach, vi } from 'vitest';
+import { mkdirSync, rmSync } from 'node:fs';
+import { createBloomFilter, createMessageDeduper } from '../src/transport/messageDedup.js';
+
+describe('createBloomFilter', () => {
+  it('reports added values as present and unseen values as absent', () => {
+    const bloom = createBloomFilter({ bits: 1024, hashes: 4 });
+    bloom.add('3EB0C767D26A1D8B1F2A');
+
+    expect(bloom.has('3EB0C767D26A1D8B1F2A')).toBe(true);
+    expect(bloom.has('BAE5F1D0C3A94E21')).toBe(false);
+  });
+
+  it('keeps the previous generation visible for one rotation', () => {
+    const bloom = createBloomFilter({ bits: 4096, hashes: 4, capacity: 2 });
+    bloom.add('gen-1-a');
+    bloom.add('gen-1-b'); // rotates: generation 1 becomes passive
+
+    expect(bloom.has('gen-1-a')).toBe(true);
+
+    bloom.add('gen-2-a');
+    bloom.add('gen-2-b'); // rotates again: generation 1 is dropped
+
+    expect(bloom.has('gen-2-a')).toBe(true);
+    expect(bloom.has('gen-1-a')).toBe(false);
+  });
+
+  it('clears all bits', () => {
+    const bloom = createBloomFilter();
+    bloom.add('msg-1');
+    bloom.clear();
+
+    expect(bloom.has('msg-1')).toBe(false);
+  });
+
+  it('rejects sizes that are not a power of two', () => {
+    expect(() => createBloomFilter({ bits: 1000 })).toThrow(/power of two/);
+  });
+});
+
+describe('createMessageDeduper', () => {
+  it('flags only repeated IDs as duplicates', () => {
+    const deduper = createMessageDeduper();
+
+    expect(deduper.isDuplicate('msg-1')).toBe(false);
+    expect(deduper.isDuplicate('msg-2')).toBe(false);
+    expect(deduper.isDuplicate('msg-1')).toBe(true);
+  });
+
+  it('remembers IDs that aged out of the exact LRU through the Bloom filter', () => {
+    const deduper = createMessageDeduper({ exactLimit: 2 });
+
+    deduper.isDuplicate('a');
+    deduper.isDuplicate('b');
+    deduper.isDuplicate('c'); // evicts 'a' from the exact LRU
+
+    expect(deduper.isDuplicate('a')).toBe(true);
+    expect(deduper.isDuplicate('d')).toBe(false);
+  });
+
+  it('accepts Bloom false positives once IDs age out of the exact LRU', () => {
+    // A tiny single-hash filter saturates quickly, so unseen IDs collide
+    const deduper = createMessageDeduper({ bloomBits: 8, bloomHashes: 1, exactLimit: 1 });
+    const ids = Array.from({ length: 64 }, (_, i) => `msg-${i}`);
+
+    expect(ids.some((id) => deduper.isDuplicate(id))).toBe(true);
+  });
+
+  it('lets a forgotten ID through again', () => {
+    const deduper = createMessageDeduper();
+    deduper.isDuplicate('msg-1');
+
+    expect(deduper.forget('msg-1')).toBe(true);
+    expect(deduper.isDuplicate('msg-1')).toBe(false);
+    expect(deduper.isDuplicate('msg-1')).toBe(true);
+  });
+
+  it('lets a forgotten ID through after it aged out of the exact LRU', () => {
+    const deduper = createMessageDeduper({ exactLimit: 1 });
+    deduper.isDuplicate('msg-1');
+    deduper.isDuplicate('msg-2'); // 'msg-1' now lives only in the Bloom filter
+
+    expect(deduper.forget('msg-1')).toBe(true);
+    expect(deduper.isDuplicate('msg-1')).toBe(false);
+    expect(deduper.forget('never-seen')).toBe(false);
+  });
+});
+
+describe('createMessageDeduper persistence', () => {
+  const STATE_PATH = './data/test-dedup-state.json';
+
+  afterEach(() => {
+    rmSync(STATE_PATH, { force: true });
+    rmSync(`${STATE_PATH}.tmp`, { force: true });
+  });
+
+  it('restores seen IDs saved by a previous instance', async () => {
+    mkdirSync('./data', { recursive: true });
+    const before = createMessageDeduper({ statePath: STATE_PATH });
+    before.isDuplicate('msg-1');
+    await before.save();
+
+    const after = createMessageDeduper({ statePath: STATE_PATH });
+    await expect(after.load()).resolves.toBe(true);
+    expect(after.isDuplicate('msg-1')).toBe(true);
+    expect(after.isDuplicate('msg-2')).toBe(false);
+  });
+
+  it('restores forgotten IDs saved by a previous instance', async () => {
+    mkdirSync('./data', { recursive: true });
+    const before = createMessageDeduper({ statePath: STATE_PATH, exactLimit: 1 });
+    before.isDuplicate('msg-1');
+    before.isDuplicate('msg-2');
+    before.forget('msg-1');
+    await before.save();
+
+    const after = createMessageDeduper({ statePath: STATE_PATH, exactLimit: 1 });
+    await expect(after.load()).resolves.toBe(true);
+    expect(after.isDuplicate('msg-1')).toBe(false);
+  });
+
+  it('starts empty when no state file exists', async () => {
+    const deduper = createMessageDeduper({ statePath: STATE_PATH });
+    await expect(deduper.load()).resolves.toBe(false);
+  });
+
+  it('ignores state written with a different filter size', async () => {
+    mkdirSync('./data', { recursive: true });
+    const small = createMessageDeduper({ statePath: STATE_PATH, bloomBits: 1024 });
+    small.isDuplicate('msg-1');
+    await small.save();
+
+    const large = createMessageDeduper({ statePath: STATE_PATH });
+    await expect(large.load()).resolves.toBe(false);
+    expect(large.isDuplicate('msg-1')).toBe(false);
+  });
+
+  it('checkpoints in the background after enough new IDs', async () => {
+    mkdirSync('./data', { recursive: true });
+    const deduper = createMessageDeduper({ statePath: STATE_PATH, checkpointEvery: 2 });
+    deduper.isDuplicate('msg-1');
+    deduper.isDuplicate('msg-2');
+
+    await vi.waitFor(async () => {
+      const restored = createMessageDeduper({ statePath: STATE_PATH });
+      expect(await restored.load()).toBe(true);
+      expect(restored.isDuplicate('msg-2')).toBe(true);
+    });
+  });
+});
@@ -1,12 +1,13 @@
 import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
-import { rmSync } from 'node:fs';
 import { initDatabase, closeDatabase } from '../src/persistence/database.js';
-import { getConversation, getConversationCount } from '../src/persistence/conversations.js';
+import { getConversationCount } from '../src/persistence/conversations.js';
 import { getMessageCount, getRecentMessages } from '../src/persistence/messages.js';
 import { setSettingsBulk } from '../src/persistence/settings.js';
 import { createOrchestrator } from '../src/conversation/orchestrator.js';
+import { createRateLimiter } from '../src/conversation/rateLimiter.js';
 
-const TEST_DB_PATH = './data/test-orchestrator.db';
+// Private in-memory database per initDatabase() — no files to create or clean up
+const TEST_DB_PATH = ':memory:';
 const TEST_CONFIG = {
   databasePath: TEST_DB_PATH,
   ai: { provider: 'openai', openaiApiKey: 'test', openaiBaseUrl: '', openaiModel: 'gpt-4o-mini' },
@@ -19,12 +20,6 @@ const TEST_CONFIG = {
   },
 };
 
-function cleanupTestDb() {
-  try { rmSync(TEST_DB_PATH, { force: true }); } catch {}
-  try { rmSync(TEST_DB_PATH + '-wal', { force: true }); } catch {}
-  try { rmSync(TEST_DB_PATH + '-shm', { force: true }); } catch {}
-}
-
 // Mock AI provider
 function createMockAIProvider(reply = 'AI says hello') {
   return {
@@ -48,7 +43,6 @@ describe('Orchestrator — handleIncomingMessage', () => {
   let mockIO;
 
   beforeEach(() => {
-    cleanupTestDb();
     initDatabase(TEST_CONFIG);
     setSettingsBulk({ local_ai_enabled: 'false', local_ai_mcp_mode: 'disabled' });
     mockAI = createMockAIProvider();
@@ -59,7 +53,6 @@ describe('Orchestrator — handleIncomingMessage', () => {
   afterEach(() => {
     orchestrator.shutdown();
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('creates a new conversation on first message', async () => {
@@ -176,6 +169,38 @@ describe('Orchestrator — handleIncomingMessage', () => {
     vi.useRealTimers();
   });
 
+  it('postpones a rate-limited reply until a token is available instead of dropping it', async () => {
+    vi.useFakeTimers();
+    setSettingsBulk({ reply_delay_min: '3000', reply_delay_max: '3000' });
+
+    // One reply per 10 s, on the faked clock
+    const replyRateLimiter = createRateLimiter({
+      capacity: 1,
+      refillPerSecond: 0.1,
+      sweepIntervalMs: 0,
+      now: () => Date.now(),
+    });
+    const localOrchestrator = createOrchestrator(TEST_CONFIG, mockAI, mockIO, { replyRateLimiter });
+
+    const first = await localOrchestrator.handleIncomingMessage('api', 'throttled-1', 'User', 'A');
+    await vi.advanceTimersByTimeAsync(3000);
+    expect(mockAI.generateReply).toHaveBeenCalledTimes(1);
+
+    await localOrchestrator.handleIncomingMessage('api', 'throttled-1', 'User', 'B');
+    await vi.advanceTimersByTimeAsync(3000);
+    // Throttled: no second AI call yet, but the reply is still pending
+    expect(mockAI.generateReply).toHaveBeenCalledTimes(1);
+
+    // First token was taken at 3 s → next one at 13 s
+    await vi.advanceTimersByTimeAsync(7000);
+    expect(mockAI.generateReply).toHaveBeenCalledTimes(2);
+    const assistantMessages = getRecentMessages(first.conversation.id, 10).filter(m => m.role === 'assistant');
+    expect(assistantMessages).toHaveLength(2);
+
+    localOrchestrator.shutdown();
+    vi.useRealTimers();
+  });
+
 });
 
 describe('Orchestrator — first-message rule', () => {
@@ -184,7 +209,6 @@ describe('Orchestrator — first-message rule', () => {
   let mockIO;
 
   beforeEach(() => {
-    cleanupTestDb();
     initDatabase(TEST_CONFIG);
     setSettingsBulk({ local_ai_enabled: 'false', local_ai_mcp_mode: 'disabled' });
     mockAI = createMockAIProvider();
@@ -195,7 +219,6 @@ describe('Orchestrator — first-message rule', () => {
   afterEach(() => {
     orchestrator.shutdown();
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('new conversation starts with auto_reply=1', async () => {
@@ -245,7 +268,6 @@ describe('Orchestrator — handleOperatorMessage', () => {
   let mockIO;
 
   beforeEach(() => {
-    cleanupTestDb();
     initDatabase(TEST_CONFIG);
     setSettingsBulk({ local_ai_enabled: 'false', local_ai_mcp_mode: 'disabled' });
     mockAI = createMockAIProvider();
@@ -256,7 +278,6 @@ describe('Orchestrator — handleOperatorMessage', () => {
   afterEach(() => {
     orchestrator.shutdown();
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('persists operator message with role=assistant', async () => {
@@ -299,14 +320,12 @@ describe('Orchestrator — AI error handling', () => {
   let mockIO;
 
   beforeEach(() => {
-    cleanupTestDb();
     initDatabase(TEST_CONFIG);
     mockIO = createMockIO();
   });
 
   afterEach(() => {
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('schedules reply instead of calling AI immediately (errors handled during delay)', async () => {
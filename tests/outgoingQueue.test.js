@@ -1,6 +1,10 @@
 import { describe, it, expect, vi, afterEach } from 'vitest';
 import { createOutgoingQueue } from '../src/conversation/outgoingQueue.js';
 
+// Date.now() follows vi.advanceTimersByTime under fake timers; the queue's default
+// monotonic clock (perf_hooks) does not
+const fakeClock = () => Date.now();
+
 describe('outgoingQueue', () => {
   afterEach(() => {
     vi.useRealTimers();
@@ -9,7 +13,7 @@ describe('outgoingQueue', () => {
   it('resolves queued content when the countdown expires', async () => {
     vi.useFakeTimers();
     const events = [];
-    const queue = createOutgoingQueue({ onChange: (action, message) => events.push({ action, message }) });
+    const queue = createOutgoingQueue({ onChange: (action, message) => events.push({ action, message }), now: fakeClock });
 
     const result = queue.enqueue({
       conversationId: 'conv-1',
@@ -28,7 +32,7 @@ describe('outgoingQueue', () => {
 
   it('pauses while editing and resumes with edited content', async () => {
     vi.useFakeTimers();
-    const queue = createOutgoingQueue();
+    const queue = createOutgoingQueue({ now: fakeClock });
     const result = queue.enqueue({
       conversationId: 'conv-2',
       messageId: 2,
@@ -49,7 +53,7 @@ describe('outgoingQueue', () => {
 
   it('resolves null when operator deletes an outgoing message', async () => {
     vi.useFakeTimers();
-    const queue = createOutgoingQueue();
+    const queue = createOutgoingQueue({ now: fakeClock });
     const result = queue.enqueue({
       conversationId: 'conv-3',
       messageId: 3,
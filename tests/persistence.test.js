@@ -1,11 +1,10 @@
 import { describe, it, expect, beforeEach, afterEach } from 'vitest';
 import Database from 'better-sqlite3';
-import { mkdirSync, rmSync } from 'node:fs';
-import { dirname } from 'node:path';
+import { rmSync } from 'node:fs';
 
 // We need to set up the database module's internal state for testing.
 // Import the module, then initialize with a test DB path.
-import { initDatabase, getDatabase, closeDatabase } from '../src/persistence/database.js';
+import { initDatabase, getDatabase, closeDatabase, runInTransaction } from '../src/persistence/database.js';
 import {
   createConversation,
   getConversation,
@@ -22,10 +21,19 @@ import {
   getMessageCount,
   getTotalMessageCount,
 } from '../src/persistence/messages.js';
+import {
+  setSetting,
+  setSettingsBulk,
+  getDelaySettings,
+  getPresenceSettings,
+  getSettingsVersion,
+} from '../src/persistence/settings.js';
 
 const TEST_DB_PATH = './data/test-persistence.db';
 
 const TEST_CONFIG = { databasePath: TEST_DB_PATH };
+// CRUD suites only need a fresh schema, not a file — schema tests keep the file-backed path
+const MEMORY_CONFIG = { databasePath: ':memory:' };
 
 function cleanupTestDb() {
   try { rmSync(TEST_DB_PATH, { force: true }); } catch {}
@@ -82,6 +90,15 @@ describe('Schema & Database', () => {
     }).toThrow();
   });
 
+  it('runInTransaction rolls back every write when one fails', () => {
+    expect(() => runInTransaction(() => {
+      createConversation({ platform: 'whatsapp', remoteId: '+358401111111' });
+      throw new Error('boom');
+    })).toThrow('boom');
+
+    expect(getConversationCount()).toBe(0);
+  });
+
   it('is idempotent — can initialize twice without error', () => {
     closeDatabase();
     expect(() => initDatabase(TEST_CONFIG)).not.toThrow();
@@ -90,13 +107,11 @@ describe('Schema & Database', () => {
 
 describe('Conversations CRUD', () => {
   beforeEach(() => {
-    cleanupTestDb();
-    initDatabase(TEST_CONFIG);
+    initDatabase(MEMORY_CONFIG);
   });
 
   afterEach(() => {
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('creates a conversation with defaults', () => {
@@ -224,15 +239,13 @@ describe('Messages CRUD', () => {
   let conversationId;
 
   beforeEach(() => {
-    cleanupTestDb();
-    initDatabase(TEST_CONFIG);
+    initDatabase(MEMORY_CONFIG);
     const conv = createConversation({ platform: 'api', remoteId: 'msg-test' });
     conversationId = conv.id;
   });
 
   afterEach(() => {
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('adds a message and returns it', () => {
@@ -329,3 +342,47 @@ describe('Messages CRUD', () => {
     }).toThrow();
   });
 });
+
+describe('Settings', () => {
+  beforeEach(() => {
+    initDatabase(MEMORY_CONFIG);
+  });
+
+  afterEach(() => {
+    closeDatabase();
+  });
+
+  it('getPresenceSettings returns seeded defaults', () => {
+    const settings = getPresenceSettings();
+    expect(settings.enabled).toBe(true);
+    expect(settings.typingSpeed).toBe(40);
+  });
+
+  it('getPresenceSettings reflects writes made after a cached read', () => {
+    expect(getPresenceSettings().readDelay).toBe(1500);
+
+    setSetting('presence_read_delay', 500);
+    expect(getPresenceSettings().readDelay).toBe(500);
+
+    setSettingsBulk({ presence_enabled: 'false', presence_typing_speed: 60 });
+    const settings = getPresenceSettings();
+    expect(settings.enabled).toBe(false);
+    expect(settings.typingSpeed).toBe(60);
+  });
+
+  it('getSettingsVersion changes only when settings are written', () => {
+    const initial = getSettingsVersion();
+    expect(getSettingsVersion()).toBe(initial);
+
+    setSetting('ai_model', 'gpt-4o-mini');
+    expect(getSettingsVersion()).not.toBe(initial);
+  });
+
+  it('getDelaySettings resolves global values and per-conversation overrides', () => {
+    setSettingsBulk({ reply_delay_min: 4000, reply_delay_max: 9000 });
+    expect(getDelaySettings()).toEqual({ replyDelayMin: 4000, replyDelayMax: 9000 });
+
+    const conversation = { use_global_delay: 0, reply_delay_min: 1000, reply_delay_max: 2000 };
+    expect(getDelaySettings(conversation)).toEqual({ replyDelayMin: 3000, replyDelayMax: 3000 });
+  });
+});
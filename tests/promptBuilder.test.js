@@ -0,0 +1,71 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest';
+import { mkdtempSync, rmSync, writeFileSync } from 'node:fs';
+import { tmpdir } from 'node:os';
+import { join } from 'node:path';
+import { buildMessages, configureMediaCache } from '../src/conversation/promptBuilder.js';
+
+const CONFIG = { defaults: { tone: 'friendly', flirt: 'none', maxHistory: 50 } };
+const IMAGE_BYTES = 1536; // 2048 base64 characters — two fit the 4096-character budget, three do not
+const CACHE_MAX_CHARS = 4096;
+
+let mediaDir;
+
+function writeImage(fileName, fill) {
+  writeFileSync(join(mediaDir, fileName), Buffer.alloc(IMAGE_BYTES, fill));
+}
+
+function imageMessage(fileName) {
+  return { role: 'user', content: '[Image]', media_type: 'image', media_path: `/media/${fileName}` };
+}
+
+// Fill byte of the image sent to the model — identifies which file contents were encoded
+async function sentImageFill(fileName) {
+  const messages = await buildMessages({ platform: 'whatsapp' }, [imageMessage(fileName)], CONFIG);
+  const { url } = messages[1].content[1].image_url;
+  return Buffer.from(url.slice(url.indexOf(',') + 1, url.indexOf(',') + 5), 'base64')[0];
+}
+
+describe('buildMessages — stored image cache', () => {
+  beforeEach(() => {
+    mediaDir = mkdtempSync(join(tmpdir(), 'anomchatbot-media-'));
+    configureMediaCache({ mediaDir, maxChars: CACHE_MAX_CHARS });
+  });
+
+  afterEach(() => {
+    configureMediaCache();
+    rmSync(mediaDir, { recursive: true, force: true });
+  });
+
+  it('reuses the encoding of an image already in the cache', async () => {
+    writeImage('cache-hit.jpg', 1);
+    expect(await sentImageFill('cache-hit.jpg')).toBe(1);
+
+    // Stored files are write-once; a changed file proves the second build skipped the read
+    writeImage('cache-hit.jpg', 2);
+    expect(await sentImageFill('cache-hit.jpg')).toBe(1);
+  });
+
+  it('evicts the least recently used image past the character budget', async () => {
+    writeImage('evict-a.jpg', 1);
+    writeImage('evict-b.jpg', 2);
+    writeImage('evict-c.jpg', 3);
+    await sentImageFill('evict-a.jpg');
+    await sentImageFill('evict-b.jpg');
+    await sentImageFill('evict-a.jpg'); // refresh 'a' so 'b' is the oldest
+    await sentImageFill('evict-c.jpg'); // 6144 characters > 4096: evicts 'b'
+
+    writeImage('evict-a.jpg', 4);
+    writeImage('evict-b.jpg', 5);
+
+    expect(await sentImageFill('evict-a.jpg')).toBe(1);
+    expect(await sentImageFill('evict-b.jpg')).toBe(5);
+  });
+
+  it('does not cache an image larger than the whole budget', async () => {
+    writeFileSync(join(mediaDir, 'too-big.jpg'), Buffer.alloc(CACHE_MAX_CHARS, 1)); // 4096 bytes → ~5.5k characters
+    expect(await sentImageFill('too-big.jpg')).toBe(1);
+
+    writeFileSync(join(mediaDir, 'too-big.jpg'), Buffer.alloc(CACHE_MAX_CHARS, 2));
+    expect(await sentImageFill('too-big.jpg')).toBe(2);
+  });
+});
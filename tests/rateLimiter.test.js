@@ -0,0 +1,113 @@
+import { describe, it, expect } from 'vitest';
+import { createRateLimiter } from '../src/conversation/rateLimiter.js';
+
+function createClock(start = 0) {
+  let current = start;
+  return {
+    now: () => current,
+    advance: (ms) => { current += ms; },
+  };
+}
+
+describe('rateLimiter', () => {
+  it('allows a burst up to capacity, then limits', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 3, refillPerSecond: 1, now: clock.now });
+
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.tryAcquire('conv-1')).toBe(false);
+  });
+
+  it('reports how long until the next token', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 2, refillPerSecond: 0.5, now: clock.now });
+
+    expect(limiter.retryAfter('conv-1')).toBe(0);
+    limiter.tryAcquire('conv-1');
+    limiter.tryAcquire('conv-1');
+    expect(limiter.tryAcquire('conv-1')).toBe(false);
+    expect(limiter.retryAfter('conv-1')).toBe(2000);
+
+    clock.advance(2000);
+    expect(limiter.retryAfter('conv-1')).toBe(0);
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+  });
+
+  it('refills tokens over time without exceeding capacity', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 2, refillPerSecond: 0.5, now: clock.now });
+
+    limiter.tryAcquire('conv-1');
+    limiter.tryAcquire('conv-1');
+    expect(limiter.tryAcquire('conv-1')).toBe(false);
+
+    clock.advance(2000); // one token back at 0.5/s
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.tryAcquire('conv-1')).toBe(false);
+
+    clock.advance(60_000); // long idle refills to capacity only
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.tryAcquire('conv-1')).toBe(false);
+  });
+
+  it('keeps separate buckets per key', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 1, refillPerSecond: 0.1, now: clock.now });
+
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.tryAcquire('conv-1')).toBe(false);
+    expect(limiter.tryAcquire('conv-2')).toBe(true);
+  });
+
+  it('caps tracked keys, evicting the least recently used', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 1, refillPerSecond: 0.001, maxKeys: 2, now: clock.now });
+
+    limiter.tryAcquire('a');
+    limiter.tryAcquire('b');
+    limiter.tryAcquire('a'); // 'a' becomes most recently used
+    limiter.tryAcquire('c'); // evicts 'b'
+
+    expect(limiter.size()).toBe(2);
+    expect(limiter.tryAcquire('b')).toBe(true); // fresh bucket
+    expect(limiter.tryAcquire('c')).toBe(false);
+  });
+
+  it('drops idle buckets that have refilled completely', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 2, refillPerSecond: 1, idleEvictMs: 10_000, now: clock.now });
+
+    limiter.tryAcquire('idle'); // full again after 1s
+    clock.advance(11_000);
+    limiter.tryAcquire('active');
+
+    expect(limiter.size()).toBe(1);
+  });
+
+  it('sweep drops every bucket that has been full long enough', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 1, refillPerSecond: 1, idleEvictMs: 5_000, now: clock.now });
+
+    limiter.tryAcquire('a');
+    limiter.tryAcquire('b');
+    clock.advance(3_000);
+    limiter.tryAcquire('c');
+    clock.advance(3_000);
+
+    expect(limiter.sweep()).toBe(2);
+    expect(limiter.size()).toBe(1);
+  });
+
+  it('reset restores a full bucket', () => {
+    const clock = createClock();
+    const limiter = createRateLimiter({ sweepIntervalMs: 0, capacity: 1, refillPerSecond: 0.1, now: clock.now });
+
+    limiter.tryAcquire('conv-1');
+    limiter.reset('conv-1');
+    expect(limiter.tryAcquire('conv-1')).toBe(true);
+    expect(limiter.size()).toBe(1);
+  });
+});
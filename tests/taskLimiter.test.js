@@ -0,0 +1,44 @@
+import { describe, it, expect } from 'vitest';
+import { createTaskLimiter } from '../src/core/taskLimiter.js';
+
+function deferred() {
+  let resolve;
+  const promise = new Promise((r) => { resolve = r; });
+  return { promise, resolve };
+}
+
+describe('taskLimiter', () => {
+  it('runs at most maxConcurrent tasks at once', async () => {
+    const limiter = createTaskLimiter(2);
+    const gates = [deferred(), deferred(), deferred()];
+    const started = [];
+
+    const results = gates.map((gate, i) => limiter.run(async () => {
+      started.push(i);
+      await gate.promise;
+      return i;
+    }));
+
+    await Promise.resolve();
+    await Promise.resolve();
+    expect(started).toEqual([0, 1]);
+    expect(limiter.getStats()).toEqual({ active: 2, waiting: 1 });
+
+    gates[0].resolve();
+    await results[0];
+    await new Promise((r) => setTimeout(r, 0));
+    expect(started).toEqual([0, 1, 2]);
+
+    gates[1].resolve();
+    gates[2].resolve();
+    await expect(Promise.all(results)).resolves.toEqual([0, 1, 2]);
+    expect(limiter.getStats()).toEqual({ active: 0, waiting: 0 });
+  });
+
+  it('releases the slot when a task fails', async () => {
+    const limiter = createTaskLimiter(1);
+
+    await expect(limiter.run(async () => { throw new Error('boom'); })).rejects.toThrow('boom');
+    await expect(limiter.run(async () => 'ok')).resolves.toBe('ok');
+  });
+});
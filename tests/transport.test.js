@@ -1,22 +1,17 @@
 import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
 import { EventEmitter } from 'node:events';
-import { rmSync } from 'node:fs';
 import Fastify from 'fastify';
 import formbody from '@fastify/formbody';
 import { TransportAdapter, TRANSPORT_STATES } from '../src/transport/base.js';
 import { WhatsAppCloudTransport } from '../src/transport/whatsappCloud.js';
+import { WhatsAppBaileysTransport } from '../src/transport/whatsappBaileys.js';
 import { createTransportManager } from '../src/transport/manager.js';
 import webhookRoutes from '../src/api/webhook.js';
 import healthRoutes from '../src/api/health.js';
 import { initDatabase, closeDatabase } from '../src/persistence/database.js';
 
-const TEST_DB_PATH = './data/test-transport.db';
-
-function cleanupTestDb() {
-  try { rmSync(TEST_DB_PATH, { force: true }); } catch {}
-  try { rmSync(TEST_DB_PATH + '-wal', { force: true }); } catch {}
-  try { rmSync(TEST_DB_PATH + '-shm', { force: true }); } catch {}
-}
+// Private in-memory database per initDatabase() — no files to create or clean up
+const TEST_DB_PATH = ':memory:';
 
 // ── Base transport adapter tests ──────────────────────────────────────────
 
@@ -110,25 +105,14 @@ describe('WhatsAppCloudTransport', () => {
       expect(transport.getStatus().status).toBe(TRANSPORT_STATES.CONNECTED);
     });
 
-    it('sets error status when access token is missing', async () => {
+    it.each([
+      ['access token', { accessToken: '' }],
+      ['phone number ID', { phoneNumberId: '' }],
+    ])('sets error status when %s is missing', async (_field, override) => {
       const badConfig = {
         whatsapp: {
           ...baseConfig.whatsapp,
-          cloud: { ...baseConfig.whatsapp.cloud, accessToken: '' },
-        },
-      };
-      const transport = new WhatsAppCloudTransport(badConfig);
-      transport.setLogger(silentLogger);
-      await transport.initialize();
-
-      expect(transport.getStatus().status).toBe(TRANSPORT_STATES.ERROR);
-    });
-
-    it('sets error status when phone number ID is missing', async () => {
-      const badConfig = {
-        whatsapp: {
-          ...baseConfig.whatsapp,
-          cloud: { ...baseConfig.whatsapp.cloud, phoneNumberId: '' },
+          cloud: { ...baseConfig.whatsapp.cloud, ...override },
         },
       };
       const transport = new WhatsAppCloudTransport(badConfig);
@@ -299,36 +283,16 @@ describe('WhatsAppCloudTransport', () => {
       });
     });
 
-    it('emits message event for image messages', () => {
-      const transport = new WhatsAppCloudTransport(baseConfig);
-      transport.setLogger(silentLogger);
-      const handler = vi.fn();
-      transport.on('message', handler);
-
-      transport.handleWebhookInbound({
-        object: 'whatsapp_business_account',
-        entry: [{
-          changes: [{
-            value: {
-              contacts: [{ wa_id: '555', profile: { name: 'Pic User' } }],
-              messages: [{
-                from: '555',
-                type: 'image',
-                image: { id: 'img-123', caption: 'Check this out' },
-              }],
-            },
-          }],
-        }],
-      });
-
-      expect(handler).toHaveBeenCalledTimes(1);
-      const call = handler.mock.calls[0][0];
-      expect(call.content).toBe('Check this out');
-      expect(call.mediaInfo).toEqual({ media_type: 'image', media_url: 'img-123', media_mime_type: 'image/jpeg' });
-      expect(typeof call.downloadMedia).toBe('function');
-    });
-
-    it('emits message event for audio messages', () => {
+    it.each([
+      ['image', { id: 'img-123', caption: 'Check this out' }, 'Check this out',
+        { media_type: 'image', media_url: 'img-123', media_mime_type: 'image/jpeg' }],
+      ['audio', { id: 'audio-456' }, '[Audio message]',
+        { media_type: 'audio', media_url: 'audio-456', media_mime_type: 'audio/ogg' }],
+      ['video', { id: 'vid-789', mime_type: 'video/3gpp' }, '[Video]',
+        { media_type: 'video', media_url: 'vid-789', media_mime_type: 'video/3gpp' }],
+      ['document', { id: 'doc-1', filename: 'report.pdf', mime_type: 'application/pdf' }, 'report.pdf',
+        { media_type: 'document', media_url: 'doc-1', media_mime_type: 'application/pdf', original_name: 'report.pdf' }],
+    ])('emits message event for %s messages', (type, payload, expectedContent, expectedMediaInfo) => {
       const transport = new WhatsAppCloudTransport(baseConfig);
       transport.setLogger(silentLogger);
       const handler = vi.fn();
@@ -340,11 +304,7 @@ describe('WhatsAppCloudTransport', () => {
           changes: [{
             value: {
               contacts: [],
-              messages: [{
-                from: '777',
-                type: 'audio',
-                audio: { id: 'audio-456' },
-              }],
+              messages: [{ from: '555', type, [type]: payload }],
             },
           }],
         }],
@@ -352,8 +312,8 @@ describe('WhatsAppCloudTransport', () => {
 
       expect(handler).toHaveBeenCalledTimes(1);
       const call = handler.mock.calls[0][0];
-      expect(call.content).toBe('[Audio message]');
-      expect(call.mediaInfo).toEqual({ media_type: 'audio', media_url: 'audio-456', media_mime_type: 'audio/ogg' });
+      expect(call.content).toBe(expectedContent);
+      expect(call.mediaInfo).toEqual(expectedMediaInfo);
       expect(typeof call.downloadMedia).toBe('function');
     });
 
@@ -425,6 +385,227 @@ describe('WhatsAppCloudTransport', () => {
   });
 });
 
+// ── Baileys transport tests ───────────────────────────────────────────────
+
+describe('WhatsAppBaileysTransport', () => {
+  const baseConfig = {
+    whatsapp: {
+      mode: 'baileys',
+      baileys: { authDir: './data/test-baileys-auth' },
+    },
+  };
+
+  const silentLogger = {
+    info: vi.fn(),
+    warn: vi.fn(),
+    error: vi.fn(),
+    debug: vi.fn(),
+  };
+
+  function createTransport() {
+    const transport = new WhatsAppBaileysTransport(baseConfig);
+    transport.setLogger(silentLogger);
+    const handler = vi.fn();
+    transport.on('message', handler);
+    return { transport, handler };
+  }
+
+  describe('_handleMessagesUpsert', () => {
+    it('emits message event for 1:1 text messages', () => {
+      const { transport, handler } = createTransport();
+
+      transport._handleMessagesUpsert({
+        type: 'notify',
+        messages: [{
+          key: { id: 'MSG1', remoteJid: '358401234567@s.whatsapp.net', fromMe: false },
+          pushName: 'Test User',
+          message: { conversation: 'Hello from Baileys' },
+        }],
+      });
+
+      expect(handler).toHaveBeenCalledTimes(1);
+      expect(handler.mock.calls[0][0]).toMatchObject({
+        from: '358401234567',
+        displayName: 'Test User',
+        content: 'Hello from Baileys',
+        mediaInfo: null,
+      });
+    });
+
+    it('builds media info for image and document messages', () => {
+      const { transport, handler } = createTransport();
+
+      transport._handleMessagesUpsert({
+        type: 'notify',
+        messages: [
+          {
+            key: { id: 'IMG1', remoteJid: '358401234567@s.whatsapp.net', fromMe: false },
+            message: { imageMessage: { mimetype: 'image/png', fileLength: '2048' } },
+          },
+          {
+            key: { id: 'DOC1', remoteJid: '358401234567@s.whatsapp.net', fromMe: false },
+            message: { documentMessage: { fileName: 'report.pdf', mimetype: 'application/pdf', fileLength: 4096 } },
+          },
+        ],
+      });
+
+      expect(handler).toHaveBeenCalledTimes(2);
+      const [image] = handler.mock.calls[0];
+      expect(image.content).toBe('[Image]');
+      expect(image.mediaInfo).toEqual({
+        media_type: 'image',
+        media_url: 'IMG1',
+        media_mime_type: 'image/png',
+        media_size_bytes: 2048,
+      });
+      expect(typeof image.downloadMedia).toBe('function');
+
+      const [doc] = handler.mock.calls[1];
+      expect(doc.content).toBe('report.pdf');
+      expect(doc.mediaInfo).toMatchObject({
+        media_type: 'document',
+        media_mime_type: 'application/pdf',
+        media_size_bytes: 4096,
+        original_name: 'report.pdf',
+      });
+    });
+
+    it('skips group chats, own messages and status broadcasts', () => {
+      const { transport, handler } = createTransport();
+
+      transport._handleMessagesUpsert({
+        type: 'notify',
+        messages: [
+          { key: { id: 'G1', remoteJid: '120363000000000000@g.us', fromMe: false }, message: { conversation: 'group' } },
+          { key: { id: 'S1', remoteJid: '358401234567@s.whatsapp.net', fromMe: true }, message: { conversation: 'self' } },
+          { key: { id: 'B1', remoteJid: 'status@broadcast', fromMe: false }, message: { conversation: 'status' } },
+        ],
+      });
+
+      expect(handler).not.toHaveBeenCalled();
+    });
+
+    it('emits a redelivered message only once', () => {
+      const { transport, handler } = createTransport();
+      const upsert = {
+        type: 'notify',
+        messages: [{
+          key: { id: 'DUP1', remoteJid: '358401234567@s.whatsapp.net', fromMe: false },
+          message: { conversation: 'Hello twice' },
+        }],
+      };
+
+      transport._handleMessagesUpsert(upsert);
+      transport._handleMessagesUpsert(upsert);
+
+      expect(handler).toHaveBeenCalledTimes(1);
+    });
+
+    it('ignores non-notify upserts', () => {
+      const { transport, handler } = createTransport();
+
+      transport._handleMessagesUpsert({
+        type: 'append',
+        messages: [{
+          key: { id: 'A1', remoteJid: '358401234567@s.whatsapp.net', fromMe: false },
+          message: { conversation: 'history sync' },
+        }],
+      });
+
+      expect(handler).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('fetchProfilePhoto', () => {
+    it('caches photo URLs per contact', async () => {
+      const { transport } = createTransport();
+      const profilePictureUrl = vi.fn().mockResolvedValue('https://pps.whatsapp.net/photo.jpg');
+      transport._socket = { profilePictureUrl };
+      transport._status = TRANSPORT_STATES.CONNECTED;
+
+      expect(await transport.fetchProfilePhoto('358401234567')).toBe('https://pps.whatsapp.net/photo.jpg');
+      expect(await transport.fetchProfilePhoto('358401234567')).toBe('https://pps.whatsapp.net/photo.jpg');
+      expect(profilePictureUrl).toHaveBeenCalledTimes(1);
+      expect(profilePictureUrl).toHaveBeenCalledWith('358401234567@s.whatsapp.net', 'image');
+    });
+
+    it('caches hidden photos as null', async () => {
+      const { transport } = createTransport();
+      const profilePictureUrl = vi.fn().mockRejectedValue(new Error('not-authorized'));
+      transport._socket = { profilePictureUrl };
+      transport._status = TRANSPORT_STATES.CONNECTED;
+
+      expect(await transport.fetchProfilePhoto('358401234567')).toBeNull();
+      expect(await transport.fetchProfilePhoto('358401234567')).toBeNull();
+      expect(profilePictureUrl).toHaveBeenCalledTimes(1);
+    });
+
+    it('caches a missing photo reported by IQ error code as null', async () => {
+      const { transport } = createTransport();
+      const notFound = Object.assign(new Error('Unknown error'), { data: 404 });
+      const profilePictureUrl = vi.fn().mockRejectedValue(notFound);
+      transport._socket = { profilePictureUrl };
+      transport._status = TRANSPORT_STATES.CONNECTED;
+
+      expect(await transport.fetchProfilePhoto('358401234567')).toBeNull();
+      expect(await transport.fetchProfilePhoto('358401234567')).toBeNull();
+      expect(profilePictureUrl).toHaveBeenCalledTimes(1);
+    });
+
+    it('retries after a transient lookup failure instead of caching it', async () => {
+      const { transport } = createTransport();
+      const profilePictureUrl = vi.fn()
+        .mockRejectedValueOnce(new Error('Timed Out'))
+        .mockResolvedValue('https://pps.whatsapp.net/photo.jpg');
+      transport._socket = { profilePictureUrl };
+      transport._status = TRANSPORT_STATES.CONNECTED;
+
+      expect(await transport.fetchProfilePhoto('358401234567')).toBeNull();
+      expect(await transport.fetchProfilePhoto('358401234567')).toBe('https://pps.whatsapp.net/photo.jpg');
+      expect(profilePictureUrl).toHaveBeenCalledTimes(2);
+    });
+  });
+
+  describe('QR handling', () => {
+    it('encodes each QR once and keeps it for late GUI clients', async () => {
+      const { transport } = createTransport();
+      const onQr = vi.fn();
+      transport.on('qr', onQr);
+
+      await transport._handleConnectionUpdate({ qr: 'qr-1' });
+      await transport._handleConnectionUpdate({ qr: 'qr-1' });
+
+      expect(onQr).toHaveBeenCalledTimes(1);
+      expect(transport.getStatus().status).toBe(TRANSPORT_STATES.WAITING_FOR_QR);
+      expect(transport.getQrDataUrl()).toBe(onQr.mock.calls[0][0].qrDataUrl);
+
+      await transport._handleConnectionUpdate({ qr: 'qr-2' });
+      expect(onQr).toHaveBeenCalledTimes(2);
+
+      await transport._handleConnectionUpdate({ connection: 'open' });
+      expect(transport.getQrDataUrl()).toBeNull();
+    });
+  });
+
+  describe('reconnect scheduling', () => {
+    it('keeps a single pending reconnect across repeated close events', async () => {
+      const { transport } = createTransport();
+      const closed = { connection: 'close', lastDisconnect: { error: { message: 'Stream errored', output: { statusCode: 428 } } } };
+
+      await transport._handleConnectionUpdate(closed);
+      const timer = transport._reconnectTimer;
+      await transport._handleConnectionUpdate(closed);
+
+      expect(timer).not.toBeNull();
+      expect(transport._reconnectTimer).toBe(timer);
+      expect(transport._reconnectAttempt).toBe(1);
+
+      await transport.shutdown();
+      expect(transport._reconnectTimer).toBeNull();
+    });
+  });
+});
+
 // ── Transport Manager tests ───────────────────────────────────────────────
 
 describe('createTransportManager', () => {
@@ -626,7 +807,6 @@ describe('Webhook routes (Cloud API)', () => {
   let transportManager;
 
   beforeEach(async () => {
-    cleanupTestDb();
     initDatabase(config);
 
     const mockOrchestrator = {
@@ -647,7 +827,6 @@ describe('Webhook routes (Cloud API)', () => {
     await transportManager.shutdown();
     await fastify.close();
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('GET webhook — verifies with correct token', async () => {
@@ -738,7 +917,6 @@ describe('Health endpoint with transport status', () => {
   let transportManager;
 
   beforeEach(async () => {
-    cleanupTestDb();
     initDatabase(config);
 
     const mockOrchestrator = {
@@ -762,7 +940,6 @@ describe('Health endpoint with transport status', () => {
     await transportManager.shutdown();
     await fastify.close();
     closeDatabase();
-    cleanupTestDb();
   });
 
   it('includes whatsapp status in health response', async () => {
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect } from 'react';
 import { getProfilePhoto } from '../api/client.js';
 
 const ACTIVITY_LABELS = {
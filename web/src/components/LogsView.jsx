@@ -1,8 +1,12 @@
 import { useCallback, useEffect, useRef, useState } from 'react';
 import { getLogs } from '../api/client.js';
 import { useSocket } from '../hooks/useSocket.js';
+import { useSocketContext } from '../context/SocketContext.jsx';
 
 const MAX_LOGS = 200;
+// Socket pushes every entry; polling only covers gaps (slow sweep) or a dropped socket (fast)
+const FALLBACK_POLL_MS = 30000;
+const DISCONNECTED_POLL_MS = 5000;
 
 function normalizeEntry(entry) {
   return {
@@ -15,16 +19,18 @@ function normalizeEntry(entry) {
 
 function mergeLogs(previous, incoming) {
   const seen = new Set(previous.map((entry) => entry.id));
-  const next = [...previous];
+  const added = [];
 
   for (const raw of incoming) {
     const entry = normalizeEntry(raw);
     if (seen.has(entry.id)) continue;
     seen.add(entry.id);
-    next.push(entry);
+    added.push(entry);
   }
 
-  return next.slice(-MAX_LOGS);
+  // Nothing new (the usual fallback poll) — keep the same array so React skips the re-render
+  if (added.length === 0) return previous;
+  return [...previous, ...added].slice(-MAX_LOGS);
 }
 
 export default function LogsView() {
@@ -45,11 +51,14 @@ export default function LogsView() {
     }
   }, []);
 
+  const { connected } = useSocketContext();
+
+  // Initial load, plus a catch-up load whenever the socket (re)connects
   useEffect(() => {
     loadLogs();
-    const interval = setInterval(loadLogs, 5000);
+    const interval = setInterval(loadLogs, connected ? FALLBACK_POLL_MS : DISCONNECTED_POLL_MS);
     return () => clearInterval(interval);
-  }, [loadLogs]);
+  }, [loadLogs, connected]);
 
   useSocket('log:entry', useCallback((entry) => {
     setLogs((prev) => mergeLogs(prev, [entry]));
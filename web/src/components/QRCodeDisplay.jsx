@@ -1,11 +1,13 @@
 import { useCallback, useEffect, useState } from 'react';
 import { regenerateQrLogin } from '../api/client.js';
 import { useQRCode, useStatus } from '../hooks/useStatus.js';
+import { useSocket } from '../hooks/useSocket.js';
 import { clearQrLoginArtifacts } from '../utils/loginCleanup.js';
 
 export default function QRCodeDisplay({ whatsappStatus }) {
   const { qrDataUrl, clearQrDataUrl } = useQRCode();
   const { refresh } = useStatus();
+  const { emit } = useSocket();
   const [generating, setGenerating] = useState(false);
   const [error, setError] = useState('');
 
@@ -15,7 +17,9 @@ export default function QRCodeDisplay({ whatsappStatus }) {
   useEffect(() => {
     clearQrLoginArtifacts();
     clearQrDataUrl();
-  }, [clearQrDataUrl]);
+    // Ask the server for the QR that is already pending rather than waiting for the next one
+    emit('transport:qr:request');
+  }, [clearQrDataUrl, emit]);
 
   const handleRegenerate = useCallback(async () => {
     setGenerating(true);
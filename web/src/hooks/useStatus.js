@@ -1,6 +1,12 @@
 import { useState, useEffect, useCallback } from 'react';
 import { getHealth } from '../api/client.js';
 import { useSocket } from './useSocket.js';
+import { useSocketContext } from '../context/SocketContext.jsx';
+
+// Transport status is pushed over the socket; polling only refreshes the rest
+// of the health payload (slow) or stands in for a dropped socket (fast)
+const FALLBACK_POLL_MS = 60000;
+const DISCONNECTED_POLL_MS = 15000;
 
 export function useStatus() {
   const [status, setStatus] = useState(null);
@@ -17,13 +23,14 @@ export function useStatus() {
     }
   }, []);
 
-  useEffect(() => { load(); }, [load]);
+  const { connected } = useSocketContext();
 
-  // Refresh periodically
+  // Initial load, plus a catch-up load whenever the socket (re)connects
   useEffect(() => {
-    const interval = setInterval(load, 15000);
+    load();
+    const interval = setInterval(load, connected ? FALLBACK_POLL_MS : DISCONNECTED_POLL_MS);
     return () => clearInterval(interval);
-  }, [load]);
+  }, [load, connected]);
 
   // Real-time status updates
   useSocket('status:update', useCallback((update) => {